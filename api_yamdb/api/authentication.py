@@ -0,0 +1,115 @@
+from django.core.cache import cache
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed, InvalidToken
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api_yamdb.settings import JWT_USER_STATE_CACHE_TIMEOUT
+
+USER_STATE_KEY = 'jwt-user-state:{user_id}'
+
+# Поля пользователя, которые передаются в токене и не требуют запроса
+# к базе. Остальные поля загружаются при первом обращении к ним.
+TOKEN_USER_FIELDS = ('username', 'role', 'is_staff')
+
+
+def get_access_token(user):
+    """Выдаёт access-токен с именем и ролью пользователя."""
+    token = AccessToken.for_user(user)
+    for field in TOKEN_USER_FIELDS:
+        token[field] = getattr(user, field)
+    return token
+
+
+def get_user_state(user_model, user_id):
+    """
+    Возвращает (is_active, role, is_staff) пользователя или None, если
+    пользователя нет. Значение хранится в кэше Django и сбрасывается
+    при изменении или удалении пользователя, а в других процессах
+    устаревает не позже чем через JWT_USER_STATE_CACHE_TIMEOUT секунд.
+    Читается из основной базы: реплика может не знать о новом
+    пользователе или о смене роли.
+    """
+    key = USER_STATE_KEY.format(user_id=user_id)
+    state = cache.get(key)
+    if state is None:
+        state = user_model.objects.using(
+            router.db_for_write(user_model)
+        ).filter(pk=user_id).values_list(
+            'is_active', 'role', 'is_staff'
+        ).first() or ()
+        cache.set(key, state, JWT_USER_STATE_CACHE_TIMEOUT)
+    return state or None
+
+
+def invalidate_user_state(user_id):
+    cache.delete(USER_STATE_KEY.format(user_id=user_id))
+
+
+def load_user(user):
+    """
+    Возвращает пользователя со всеми полями. Пользователь из токена
+    загружается одним запросом из основной базы: реплика может ещё
+    не знать о только что зарегистрированном пользователе.
+    """
+    if not user.get_deferred_fields():
+        return user
+    model = type(user)
+    return model._base_manager.using(
+        router.db_for_write(model)
+    ).get(pk=user.pk)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT без чтения пользователя из базы на каждый запрос.
+    Пользователь собирается из полей токена как экземпляр модели
+    с отложенными остальными полями, поэтому работает в проверках прав
+    и в связях (author=request.user). Отзыв токена и смена роли
+    проверяются по состоянию пользователя из кэша. Токены без полей
+    пользователя обрабатываются как в JWTAuthentication.
+    """
+
+    def get_user(self, validated_token):
+        claims = validated_token.payload
+        if not all(field in claims for field in TOKEN_USER_FIELDS):
+            return super().get_user(validated_token)
+        try:
+            user_id = claims[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатор пользователя.'
+            )
+
+        state = get_user_state(self.user_model, user_id)
+        if state is None:
+            raise AuthenticationFailed(
+                'Пользователь не найден.', code='user_not_found'
+            )
+        is_active, role, is_staff = state
+        if not is_active:
+            raise AuthenticationFailed(
+                'Пользователь неактивен.', code='user_inactive'
+            )
+        if (role, is_staff) != (claims['role'], claims['is_staff']):
+            raise AuthenticationFailed(
+                'Права пользователя изменились, получите новый токен.',
+                code='token_outdated'
+            )
+
+        values = dict(
+            {field: claims[field] for field in TOKEN_USER_FIELDS},
+            id=user_id, is_active=is_active
+        )
+        concrete_fields = self.user_model._meta.concrete_fields
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model),
+            list(values),
+            [
+                values[field.attname] for field in concrete_fields
+                if field.attname in values
+            ]
+        )
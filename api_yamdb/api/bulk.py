@@ -0,0 +1,105 @@
+from django.db import connections, transaction
+
+from api.pagination import invalidate_count_cache
+from reviews.models import Title, fold_name
+from reviews.search import index_titles
+
+BULK_BATCH_SIZE = 500
+
+TitleGenre = Title.genre.through
+
+
+def assign_created_pks(model, objs, using='default'):
+    """
+    Проставляет первичные ключи объектам после bulk_create, если база
+    не вернула их сама (SQLite в Django 3.2). Вызывается внутри той же
+    транзакции: после первого INSERT запись в SQLite заблокирована для
+    других соединений, поэтому последние len(objs) ключей таблицы
+    принадлежат только что вставленным строкам в порядке вставки.
+    """
+    if not objs or objs[0].pk is not None:
+        return
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or not connection.in_atomic_block:
+        raise RuntimeError(
+            'Ключи созданных записей можно восстановить только внутри '
+            'транзакции SQLite.'
+        )
+    pks = list(model.objects.using(using).order_by('-pk').values_list(
+        'pk', flat=True
+    )[:len(objs)])
+    for obj, pk in zip(objs, reversed(pks)):
+        obj.pk = pk
+
+
+def add_title_genres(genres_by_title):
+    """Добавляет связи произведений с жанрами одной вставкой."""
+    TitleGenre.objects.bulk_create(
+        [
+            TitleGenre(title_id=title_id, genre_id=genre.pk)
+            for title_id, genres in genres_by_title.items()
+            for genre in genres
+        ],
+        batch_size=BULK_BATCH_SIZE, ignore_conflicts=True
+    )
+
+
+def set_title_genres(genres_by_title):
+    """Заменяет жанры произведений."""
+    TitleGenre.objects.filter(title_id__in=list(genres_by_title)).delete()
+    add_title_genres(genres_by_title)
+
+
+def bulk_create_titles(items):
+    """
+    Создаёт произведения из проверенных данных сериализатора вместе
+    со связями с жанрами в одной транзакции.
+    """
+    titles, genres = [], []
+    for data in items:
+        data = dict(data)
+        genres.append(data.pop('genre', []))
+        title = Title(**data)
+        title.name_folded = fold_name(title.name)
+        titles.append(title)
+    with transaction.atomic():
+        Title.objects.bulk_create(titles, batch_size=BULK_BATCH_SIZE)
+        assign_created_pks(Title, titles)
+        add_title_genres({
+            title.pk: title_genres
+            for title, title_genres in zip(titles, genres)
+        })
+        index_titles(titles)
+    invalidate_count_cache(Title)
+    return titles
+
+
+def bulk_update_titles(pairs):
+    """
+    Частично обновляет произведения: pairs - пары (произведение,
+    проверенные данные сериализатора). Все изменения выполняются
+    в одной транзакции.
+    """
+    fields, genres = set(), {}
+    for title, data in pairs:
+        data = dict(data)
+        if 'genre' in data:
+            genres[title.pk] = data.pop('genre')
+        for name, value in data.items():
+            setattr(title, name, value)
+        fields.update(data)
+        title.name_folded = fold_name(title.name)
+    if 'name' in fields:
+        fields.add('name_folded')
+    titles = [title for title, _ in pairs]
+    with transaction.atomic():
+        if fields:
+            Title.objects.bulk_update(
+                titles, sorted(fields), batch_size=BULK_BATCH_SIZE
+            )
+        if genres:
+            set_title_genres(genres)
+        if fields & {'name', 'description'}:
+            index_titles(titles)
+    invalidate_count_cache(Title)
+    return titles
@@ -1,19 +1,37 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
 
-from reviews.models import Title
+from reviews.models import Title, fold_name
+from reviews.search import search_titles
+
+
+PREFIX_UPPER_BOUND = chr(0x10FFFF)
+
+
+def filter_folded_prefix(queryset, field_name, value):
+    """
+    Префиксный поиск по столбцу со свёрнутым регистром.
+    Условие записано диапазоном, чтобы выполняться сканированием индекса.
+    """
+    value = fold_name(value)
+    return queryset.filter(**{
+        f'{field_name}__gte': value,
+        f'{field_name}__lt': value + PREFIX_UPPER_BOUND,
+    })
 
 
 class TitleFilter(filters.FilterSet):
     """Фильтр выборки произведений по определенным полям."""
 
     category = filters.CharFilter(
-        field_name='category__slug', lookup_expr='icontains'
+        field_name='category__slug', lookup_expr='exact'
     )
     genre = filters.CharFilter(
-        field_name='genre__slug', lookup_expr='icontains'
+        field_name='genre__slug', lookup_expr='exact'
     )
     name = filters.CharFilter(
-        field_name='name', lookup_expr='contains'
+        field_name='name_folded', method='filter_name'
     )
     year = filters.NumberFilter(
         field_name='year', lookup_expr='exact'
@@ -22,3 +40,31 @@ class TitleFilter(filters.FilterSet):
     class Meta:
         model = Title
         fields = ('category', 'genre', 'name', 'year')
+
+    def filter_name(self, queryset, name, value):
+        return filter_folded_prefix(queryset, name, value)
+
+
+class NamePrefixSearchFilter(BaseFilterBackend):
+    """Поиск по началу названия без учёта регистра."""
+
+    search_param = api_settings.SEARCH_PARAM
+    field_name = 'name_folded'
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+        return filter_folded_prefix(queryset, self.field_name, term)
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск произведений по названию и описанию."""
+
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+        return search_titles(queryset, term)
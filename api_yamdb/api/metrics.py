@@ -0,0 +1,263 @@
+import atexit
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.db import connections
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+from api_yamdb.settings import (
+    METRICS_DIR, METRICS_FLUSH_INTERVAL, METRICS_LATENCY_BUCKETS
+)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+logger = logging.getLogger('api.metrics')
+
+# Положение значений в списке счётчиков одной серии.
+COUNT, DURATION, QUERIES, RESPONSE_BYTES, BUCKETS = range(5)
+
+
+class MetricsRegistry:
+    """
+    Счётчики запросов процесса по представлению, методу и статусу:
+    количество, сумма времени, гистограмма времени, SQL-запросы и размер
+    ответов. Запись в счётчики - одна короткая секция под общей
+    блокировкой, без ввода-вывода. Раз в METRICS_FLUSH_INTERVAL секунд
+    снимок счётчиков атомарно записывается в файл процесса
+    metrics-<pid>.json, а при выгрузке файлы всех процессов суммируются.
+    Ошибка записи файла только пишется в лог и не влияет на запрос.
+    """
+
+    def __init__(self, directory=METRICS_DIR, buckets=METRICS_LATENCY_BUCKETS,
+                 flush_interval=METRICS_FLUSH_INTERVAL, pid=None):
+        self.directory = Path(directory)
+        self.buckets = tuple(buckets)
+        self.flush_interval = flush_interval
+        self.pid = pid
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        """
+        Начинает счётчики заново. Вызывается и в дочернем процессе после
+        fork: сервер, загружающий приложение до запуска рабочих процессов
+        (uWSGI, gunicorn --preload), иначе передал бы им счётчики
+        и блокировки главного процесса.
+        """
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._series = defaultdict(self._new_values)
+        self._flushed = time.monotonic()
+
+    def _new_values(self):
+        return [0, 0.0, 0, 0] + [0] * (len(self.buckets) + 1)
+
+    @property
+    def path(self):
+        """Файл текущего процесса; pid берётся при каждой записи."""
+        return self.directory / f'metrics-{self.pid or os.getpid()}.json'
+
+    def observe(self, view, method, status, duration, queries,
+                response_bytes):
+        bucket = bisect.bisect_left(self.buckets, duration)
+        with self._lock:
+            values = self._series[view, method, status]
+            values[COUNT] += 1
+            values[DURATION] += duration
+            values[QUERIES] += queries
+            values[RESPONSE_BYTES] += response_bytes
+            values[BUCKETS + bucket] += 1
+            flush = time.monotonic() - self._flushed >= self.flush_interval
+            if flush:
+                self._flushed = time.monotonic()
+        if flush:
+            try:
+                self.flush()
+            except OSError:
+                logger.exception('Не удалось записать метрики в %s', self.path)
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                [*key, *values] for key, values in self._series.items()
+            ]
+
+    def flush(self):
+        """
+        Записывает снимок счётчиков процесса в его файл. Потоки
+        записывают файл по очереди, иначе один из них заменил бы общий
+        временный файл, уже перенесённый другим.
+        """
+        with self._flush_lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(self.path.name + '.tmp')
+            temp_path.write_text(
+                json.dumps(self.snapshot()), encoding='utf-8'
+            )
+            os.replace(temp_path, self.path)
+
+    def collect(self):
+        """
+        Суммирует счётчики всех процессов. Файлы с другими границами
+        гистограммы пропускаются.
+        """
+        self.flush()
+        series = defaultdict(self._new_values)
+        size = len(self._new_values())
+        for path in self.directory.glob('metrics-*.json'):
+            try:
+                rows = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+            for row in rows:
+                key, values = tuple(row[:3]), row[3:]
+                if len(values) != size:
+                    continue
+                merged = series[key]
+                for index, value in enumerate(values):
+                    merged[index] += value
+        return series
+
+    def render(self):
+        """Выгрузка счётчиков в текстовом формате Prometheus."""
+        series = self.collect()
+        views = defaultdict(self._new_values)
+        for (view, method, _), values in series.items():
+            merged = views[view, method]
+            for index, value in enumerate(values):
+                merged[index] += value
+        lines = [
+            '# HELP yamdb_requests_total Количество запросов.',
+            '# TYPE yamdb_requests_total counter',
+        ]
+        for (view, method, status), values in sorted(series.items()):
+            labels = format_labels(view=view, method=method, status=status)
+            lines.append(f'yamdb_requests_total{{{labels}}} {values[COUNT]}')
+        lines += [
+            '# HELP yamdb_request_duration_seconds Время обработки запроса.',
+            '# TYPE yamdb_request_duration_seconds histogram',
+        ]
+        for (view, method), values in sorted(views.items()):
+            lines += self.render_histogram(view, method, values)
+        for name, index, help_text in (
+            ('yamdb_db_queries_total', QUERIES, 'Количество SQL-запросов.'),
+            ('yamdb_response_bytes_total', RESPONSE_BYTES,
+             'Размер тел ответов в байтах.'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for (view, method), values in sorted(views.items()):
+                labels = format_labels(view=view, method=method)
+                lines.append(f'{name}{{{labels}}} {values[index]}')
+        return '\n'.join(lines) + '\n'
+
+    def render_histogram(self, view, method, values):
+        name = 'yamdb_request_duration_seconds'
+        labels = format_labels(view=view, method=method)
+        lines, cumulative = [], 0
+        for bound, count in zip(
+            (*map(str, self.buckets), '+Inf'), values[BUCKETS:]
+        ):
+            cumulative += count
+            lines.append(
+                f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            )
+        lines.append(f'{name}_sum{{{labels}}} {values[DURATION]}')
+        lines.append(f'{name}_count{{{labels}}} {values[COUNT]}')
+        return lines
+
+
+def format_labels(**labels):
+    return ','.join(
+        f'{name}="{escape_label(value)}"' for name, value in labels.items()
+    )
+
+
+def escape_label(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace(
+        '\n', r'\n'
+    )
+
+
+registry = MetricsRegistry()
+atexit.register(lambda: registry.flush())
+
+
+def get_registry():
+    return registry
+
+
+def get_view_name(request, view_func):
+    """
+    Имя представления для меток: класс и действие для вьюсетов DRF
+    (TitleViewSet.list), класс для APIView (TokenView), имя функции
+    для остальных представлений.
+    """
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return getattr(view_func, '__name__', 'view')
+    actions = getattr(view_func, 'actions', None)
+    if actions is None:
+        return cls.__name__
+    method = request.method.lower()
+    return f'{cls.__name__}.{actions.get(method, method)}'
+
+
+class QueryCounter:
+    """Обёртка для connection.execute_wrapper, считающая запросы."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """Передаёт в registry время, статус, SQL-запросы и размер ответа."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        registry.observe(
+            getattr(request, 'metrics_view', 'unmatched'),
+            request.method,
+            response.status_code,
+            time.perf_counter() - started,
+            counter.count,
+            0 if isinstance(response, StreamingHttpResponse)
+            else len(response.content),
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_view = get_view_name(request, view_func)
+
+
+class PrometheusRenderer(BaseRenderer):
+    """Рендерер текстового формата Prometheus."""
+
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        return json.dumps(data, ensure_ascii=False).encode(self.charset)
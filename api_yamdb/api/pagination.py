@@ -0,0 +1,254 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from hashlib import md5
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from api_yamdb.settings import (
+    PAGINATION_COUNT_CACHE_TIMEOUT, PAGINATION_COUNT_ESTIMATE_THRESHOLD
+)
+
+COUNT_VERSION_KEY = 'pagination-count-version:{label}'
+COUNT_KEY = 'pagination-count:{label}:{version}:{digest}'
+
+
+def get_count_version(model):
+    """Возвращает текущую версию кэша количества записей модели."""
+    return cache.get(
+        COUNT_VERSION_KEY.format(label=model._meta.label_lower), 0
+    )
+
+
+def invalidate_count_cache(model):
+    """
+    Сбрасывает кэш количества записей модели и моделей, которые ссылаются
+    на неё и могут фильтроваться по её полям.
+    """
+    models = {model} | {
+        relation.related_model for relation in model._meta.related_objects
+    }
+    for related_model in models:
+        key = COUNT_VERSION_KEY.format(label=related_model._meta.label_lower)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def estimate_count(queryset):
+    """
+    Оценивает количество строк таблицы по статистике базы данных.
+    Оценка возможна только для запросов без условий; иначе возвращает None.
+    """
+    if queryset.query.where:
+        return None
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    if connection.vendor == 'sqlite':
+        sql = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s'
+    elif connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass'
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None or row[0] is None:
+        return None
+    return int(str(row[0]).split()[0])
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Пагинатор, который кэширует количество записей по нормализованному
+    SQL-запросу без сортировки. Кэш сбрасывается при записи в модель
+    (см. api.signals) и в любом случае живёт не дольше cache_timeout секунд.
+    Для больших таблиц без фильтров вместо COUNT(*) используется оценка
+    из статистики базы данных.
+    """
+
+    cache_timeout = PAGINATION_COUNT_CACHE_TIMEOUT
+    estimate_threshold = PAGINATION_COUNT_ESTIMATE_THRESHOLD
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+        key = self.get_cache_key(queryset)
+        count = cache.get(key)
+        if count is None:
+            count = self.get_estimated_count(queryset)
+            if count is None:
+                count = queryset.count()
+            cache.set(key, count, self.cache_timeout)
+        return count
+
+    def get_estimated_count(self, queryset):
+        if self.estimate_threshold is None:
+            return None
+        estimate = estimate_count(queryset)
+        if estimate is None or estimate <= self.estimate_threshold:
+            return None
+        return estimate
+
+    def get_cache_key(self, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = md5(repr((sql, params)).encode('utf-8')).hexdigest()
+        return COUNT_KEY.format(
+            label=queryset.model._meta.label_lower,
+            version=get_count_version(queryset.model),
+            digest=digest,
+        )
+
+
+class CachedCountPageNumberPagination(PageNumberPagination):
+    """Постраничная пагинация с кэшируемым количеством записей."""
+
+    django_paginator_class = CachedCountPaginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная пагинация по составному ключу сортировки.
+    Курсор хранит значения ключа последней (или первой) записи страницы,
+    поэтому следующая страница выбирается условием WHERE по индексу
+    без OFFSET и без COUNT(*).
+    При наличии в запросе параметра из legacy_query_params ответ отдаётся
+    в прежнем постраничном формате.
+    """
+
+    ordering = None
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    legacy_query_params = ('page',)
+    legacy_pagination_class = CachedCountPageNumberPagination
+    invalid_cursor_message = _('Invalid cursor')
+
+    def get_ordering(self, queryset):
+        return self.ordering or queryset.model._meta.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if any(
+            param in request.query_params
+            for param in self.legacy_query_params
+        ):
+            self.legacy = self.legacy_pagination_class()
+            return self.legacy.paginate_queryset(queryset, request, view)
+        self.legacy = None
+        self.base_url = request.build_absolute_uri()
+        ordering = self.get_ordering(queryset)
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip('-'))
+            for name in ordering
+        ]
+        reverse, position = self.decode_cursor(request)
+        if reverse:
+            ordering = [self._invert(name) for name in ordering]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(ordering, position)
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return self.page
+
+    def get_keyset_filter(self, ordering, position):
+        """
+        Строит условие «строго после позиции» для заданной сортировки:
+        (a > x) OR (a = x AND b > y) OR ...
+        """
+        condition = Q()
+        equal = {}
+        for name, value in zip(ordering, position):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        return condition
+
+    def get_paginated_response(self, data):
+        if self.legacy:
+            return self.legacy.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(True, self.page[0])
+
+    def encode_cursor(self, reverse, instance):
+        payload = [reverse] + [
+            field.value_to_string(instance) for field in self.fields
+        ]
+        cursor = urlsafe_b64encode(
+            json.dumps(payload).encode('utf-8')
+        ).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request):
+        """Возвращает направление и позицию из курсора запроса."""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is None:
+            return False, None
+        try:
+            reverse, *values = json.loads(
+                urlsafe_b64decode(cursor.encode('ascii'))
+            )
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return bool(reverse), position
+
+    @staticmethod
+    def _invert(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+
+class TitlePagination(KeysetPagination):
+    """
+    Пагинация произведений. Результаты поиска отсортированы по
+    релевантности, которая не является ключом курсора, поэтому они
+    отдаются постранично.
+    """
+
+    legacy_query_params = ('page', api_settings.SEARCH_PARAM)
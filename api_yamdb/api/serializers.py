@@ -1,16 +1,22 @@
 from django.db import IntegrityError
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.encoding import smart_str
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
+from api.authentication import get_access_token
+from api.timing import TimedSerializerMixin
 from reviews.models import (
     Category, Comment, Genre, Review, Title, YamdbUser, MAX_LENGTH
 )
+from reviews.reference_cache import get_reference_cache
 from reviews.validators import validate_username
 
 
-class AuthUserSerializer(serializers.ModelSerializer):
+class AuthUserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = YamdbUser
         fields = 'username', 'email', 'role', 'first_name', 'last_name', 'bio'
@@ -29,7 +35,7 @@ class TokenSerializer(serializers.Serializer):
 
         if not default_token_generator.check_token(user, confirmation_code):
             raise serializers.ValidationError('Неверный код подтверждения.')
-        return data
+        return {'token': str(get_access_token(user))}
 
 
 class UserRegistrationSerializer(serializers.Serializer):
@@ -61,7 +67,23 @@ class UserRegistrationSerializer(serializers.Serializer):
             )
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class ReferenceSlugRelatedField(serializers.SlugRelatedField):
+    """Поле slug категории или жанра, которое ищет объект в кэше процесса."""
+
+    def to_internal_value(self, data):
+        reference_cache = get_reference_cache(self.queryset.model)
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = reference_cache.get_by_slug(data)
+        if obj is None:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field, value=smart_str(data)
+            )
+        return obj
+
+
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор категории."""
 
     class Meta:
@@ -69,7 +91,7 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug', )
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор жанра."""
 
     class Meta:
@@ -77,7 +99,8 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug', )
 
 
-class TitleViewingSerializer(serializers.ModelSerializer):
+class TitleViewingSerializer(TimedSerializerMixin,
+                             serializers.ModelSerializer):
     """Сериализатор произведения в режиме просмотра."""
 
     category = CategorySerializer(
@@ -105,13 +128,14 @@ class TitleViewingSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class TitleEditingSerializer(serializers.ModelSerializer):
+class TitleEditingSerializer(TimedSerializerMixin,
+                             serializers.ModelSerializer):
     """Сериализатор произведения в режиме создания/редактирования."""
 
-    category = serializers.SlugRelatedField(
+    category = ReferenceSlugRelatedField(
         queryset=Category.objects.all(), slug_field='slug'
     )
-    genre = serializers.SlugRelatedField(
+    genre = ReferenceSlugRelatedField(
         queryset=Genre.objects.all(), slug_field='slug', many=True
     )
 
@@ -127,7 +151,7 @@ class TitleEditingSerializer(serializers.ModelSerializer):
         )
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели Review."""
     author = serializers.SlugRelatedField(slug_field='username',
                                           read_only=True)
@@ -136,21 +160,25 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'score', 'author', 'pub_date')
 
-    def validate(self, attrs):
-        request = self.context['request']
-        if request.method == 'POST':
-            title = get_object_or_404(
-                Title,
-                pk=self.context['view'].kwargs.get('title_id')
-            )
-            if Review.objects.filter(title=title,
-                                     author=request.user).exists():
-                raise serializers.ValidationError("Вы уже оставляли отзыв.")
-
-        return attrs
+    def create(self, validated_data):
+        """
+        Создаёт отзыв одним INSERT-запросом.
+        Повторный отзыв отсекается ограничением unique_title_author,
+        а несуществующее произведение - внешним ключом.
+        """
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Title.objects.filter(
+                pk=validated_data['title_id']
+            ).exists():
+                raise Http404
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: ['Вы уже оставляли отзыв.']
+            })
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели Comment."""
     author = serializers.SlugRelatedField(slug_field='username',
                                           read_only=True)
@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import invalidate_user_state
+from api.pagination import invalidate_count_cache
+from reviews.models import Category, Comment, Genre, Review, Title, YamdbUser
+
+# Модели, количество записей которых кэширует пагинация, и справочники,
+# по которым фильтруются произведения.
+COUNTED_MODELS = (Category, Comment, Genre, Review, Title, YamdbUser)
+
+
+def reset_count_cache(sender, using, **kwargs):
+    """
+    Сбрасывает кэш количества записей после фиксации транзакции,
+    чтобы параллельный запрос не закэшировал количество до неё.
+    """
+    transaction.on_commit(lambda: invalidate_count_cache(sender), using=using)
+
+
+for model in COUNTED_MODELS:
+    post_save.connect(reset_count_cache, sender=model)
+    post_delete.connect(reset_count_cache, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def reset_count_cache_on_m2m(sender, instance, model, using, **kwargs):
+    """Сбрасывает кэш количества записей после изменения связей."""
+    def invalidate():
+        invalidate_count_cache(type(instance))
+        invalidate_count_cache(model)
+    transaction.on_commit(invalidate, using=using)
+
+
+@receiver(post_save, sender=YamdbUser)
+@receiver(post_delete, sender=YamdbUser)
+def reset_user_state_cache(sender, instance, **kwargs):
+    """Сбрасывает кэшированное состояние пользователя для проверки JWT."""
+    invalidate_user_state(instance.pk)
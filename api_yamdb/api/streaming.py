@@ -0,0 +1,51 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+
+class NdjsonRenderer(BaseRenderer):
+    """
+    Рендерер ndjson. Сами выгрузки отдаются StreamingHttpResponse,
+    а рендерер нужен для согласования формата и ответов с ошибками.
+    """
+
+    media_type = NDJSON_CONTENT_TYPE
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (
+            json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+        ).encode(self.charset)
+
+
+def iterate_in_chunks(queryset, chunk_size):
+    """
+    Перебирает queryset пачками по возрастанию первичного ключа.
+    В отличие от iterator(), для каждой пачки выполняются
+    prefetch_related, а в памяти одновременно находится одна пачка.
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(
+            pk__gt=last_pk
+        )
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+        yield from chunk
+        last_pk = chunk[-1].pk
+
+
+def ndjson_lines(serializer_class, objects, context=None):
+    """Сериализует объекты по одному в строки ndjson."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for obj in objects:
+        data = serializer_class(obj, context=context).data
+        yield encoder.encode(data) + '\n'
@@ -0,0 +1,123 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.db import connections
+
+from api_yamdb.settings import SERVER_TIMING_SAMPLE_RATE
+
+logger = logging.getLogger('api.timing')
+
+current_timings = ContextVar('current_timings', default=None)
+
+
+class RequestTimings:
+    """Счётчики времени одного запроса: SQL-запросы и сериализация."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.query_count = 0
+        self.query_time = 0.0
+        self.slowest_query = None
+        self.slowest_query_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обёртка для connection.execute_wrapper."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.query_count += 1
+            self.query_time += elapsed
+            if elapsed > self.slowest_query_time:
+                self.slowest_query_time = elapsed
+                self.slowest_query = sql
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def get_header(self):
+        """Значение заголовка Server-Timing, длительности в миллисекундах."""
+        return ', '.join((
+            f'total;dur={self.total * 1000:.2f}',
+            f'db;dur={self.query_time * 1000:.2f};'
+            f'desc="{self.query_count} queries"',
+            f'db-slowest;dur={self.slowest_query_time * 1000:.2f}',
+            f'serializer;dur={self.serializer_time * 1000:.2f}',
+        ))
+
+    def as_dict(self):
+        return {
+            'total_ms': round(self.total * 1000, 2),
+            'db_queries': self.query_count,
+            'db_ms': round(self.query_time * 1000, 2),
+            'db_slowest_ms': round(self.slowest_query_time * 1000, 2),
+            'db_slowest_sql': self.slowest_query,
+            'serializer_ms': round(self.serializer_time * 1000, 2),
+        }
+
+
+class TimedSerializerMixin:
+    """
+    Добавляет время to_representation к счётчикам текущего запроса.
+    Учитывается только внешний вызов: вложенные сериализаторы и
+    элементы списка не считаются повторно.
+    """
+
+    def to_representation(self, instance):
+        timings = current_timings.get()
+        if timings is None or timings.serializing:
+            return super().to_representation(instance)
+        timings.serializing = True
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            timings.serializer_time += time.perf_counter() - started
+            timings.serializing = False
+
+
+class ServerTimingMiddleware:
+    """
+    Для доли запросов SERVER_TIMING_SAMPLE_RATE считает общее время,
+    количество и время SQL-запросов, самый медленный запрос и время
+    сериализации. Результат отдаётся в заголовке Server-Timing и пишется
+    в лог api.timing одной JSON-строкой. Остальные запросы проходят
+    без измерений. Потоковые ответы тоже не размечаются: их тело
+    с запросами к базе и сериализацией формируется уже после возврата
+    из middleware, и цифры были бы неполными.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= SERVER_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        if response.streaming:
+            return response
+        timings.finish()
+        response['Server-Timing'] = timings.get_header()
+        logger.info(json.dumps(dict(
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+            **timings.as_dict(),
+        ), ensure_ascii=False))
+        return response
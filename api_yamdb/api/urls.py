@@ -2,8 +2,8 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from api.views import (
-    CategoryViewSet, CommentViewSet, GenreViewSet, ReviewViewSet, TitleViewSet,
-    SignUpView, TokenView, UserListViewSet
+    CategoryViewSet, CommentViewSet, GenreViewSet, MetricsView, ReviewViewSet,
+    TitleViewSet, SignUpView, TokenView, UserListViewSet
 )
 
 router_v1 = DefaultRouter()
@@ -26,4 +26,5 @@ registrations_url = [
 urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/', include(registrations_url)),
+    path('v1/metrics/', MetricsView.as_view(), name='metrics'),
 ]
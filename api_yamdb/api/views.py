@@ -1,49 +1,82 @@
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets, mixins
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework_simplejwt.views import TokenViewBase
 
-from api.filters import TitleFilter
+from api.authentication import load_user
+from api.bulk import bulk_create_titles, bulk_update_titles
+from api.filters import NamePrefixSearchFilter, TitleFilter, TitleSearchFilter
+from api.metrics import (
+    PROMETHEUS_CONTENT_TYPE, PrometheusRenderer, get_registry
+)
+from api.pagination import TitlePagination
 from api.permissions import AdminOrReadOnly, IsAdmin
+from api.streaming import (
+    NDJSON_CONTENT_TYPE, NdjsonRenderer, iterate_in_chunks, ndjson_lines
+)
 from api.serializers import (
     CategorySerializer, CommentSerializer, GenreSerializer, ReviewSerializer,
     TitleEditingSerializer, TitleViewingSerializer, UserRegistrationSerializer,
     TokenSerializer, AuthUserSerializer
 )
-from api.viewsets import AbstractReviewCommentViewSet
-from reviews.models import Category, Genre, Review, Title, YamdbUser
-from api_yamdb.settings import USER_URL_PATH_NAME, DEFAULT_FROM_EMAIL
+from api.viewsets import (
+    AbstractReviewCommentViewSet, SerializedWriteMixin, serialized_write
+)
+from reviews.models import (
+    Category, Genre, Review, Title, YamdbUser, fold_name
+)
+from reviews.outbox import enqueue_email
+from reviews.reference_cache import get_reference_cache
+from api_yamdb.settings import USER_URL_PATH_NAME
 
 
 def send_confirmation_code(user, confirmation_code):
-    """Генерация кода подтверждения и его отправка."""
-    send_mail(
+    """
+    Ставит письмо с кодом подтверждения в очередь на отправку.
+    Письмо отправляет команда send_outbox_emails.
+    """
+    enqueue_email(
+        user.email,
         'Yamdb. Код подтверждения',
         f'Код подтверждения: {confirmation_code}',
-        from_email=DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email]
     )
 
 
-class CategoryGenreBaseViewSet(mixins.CreateModelMixin,
+class CategoryGenreBaseViewSet(SerializedWriteMixin,
+                               mixins.CreateModelMixin,
                                mixins.ListModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet):
     """Вьюсет, позволяющий осуществлять GET, POST и DELETE запросы."""
 
     permission_classes = (AdminOrReadOnly,)
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('name',)
+    filter_backends = (NamePrefixSearchFilter,)
     lookup_field = 'slug'
 
+    def list(self, request, *args, **kwargs):
+        """Отдаёт список из кэша справочника без запросов к базе."""
+        objects = get_reference_cache(self.queryset.model).all()
+        term = request.query_params.get(api_settings.SEARCH_PARAM, '').strip()
+        if term:
+            prefix = fold_name(term)
+            objects = [
+                obj for obj in objects if obj.name_folded.startswith(prefix)
+            ]
+        page = self.paginate_queryset(objects)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
 
 class CategoryViewSet(CategoryGenreBaseViewSet):
     """Вьюсет для категорий."""
@@ -59,35 +92,192 @@ class GenreViewSet(CategoryGenreBaseViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(SerializedWriteMixin, ModelViewSet):
     """Вьюсет для произведений."""
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by(*Title._meta.ordering)
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     permission_classes = (AdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    pagination_class = TitlePagination
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitleFilter
     http_method_names = ('get', 'post', 'patch', 'delete')
+    export_chunk_size = 500
+    bulk_max_items = 10000
+    batch_max_ids = 500
+    max_id = 2 ** 63 - 1
 
     def get_serializer_class(self):
         """Определяет сериализатор в зависимости от типа запроса."""
-        if self.action in ('list', 'retrieve'):
+        if self.action in ('list', 'retrieve', 'export', 'batch'):
             return TitleViewingSerializer
         return TitleEditingSerializer
 
+    @action(
+        methods=['GET'],
+        detail=False,
+        renderer_classes=[NdjsonRenderer, JSONRenderer]
+    )
+    def export(self, request):
+        """
+        Потоково отдаёт все произведения, подходящие под фильтры,
+        в формате ndjson: по одному произведению на строку.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            ndjson_lines(
+                self.get_serializer_class(),
+                iterate_in_chunks(queryset, self.export_chunk_size),
+                self.get_serializer_context(),
+            ),
+            content_type=NDJSON_CONTENT_TYPE
+        )
+
+    @action(methods=['GET'], detail=False)
+    def batch(self, request):
+        """
+        Возвращает произведения по списку id из параметра ids
+        (через запятую) в порядке запроса. Отсутствующие id
+        перечисляются в missing.
+        """
+        raw_ids = request.query_params.get('ids', '').split(',')
+        try:
+            ids = list(dict.fromkeys(
+                int(pk) for pk in raw_ids if pk.strip()
+            ))
+        except ValueError:
+            raise ValidationError({'ids': ['Ожидается список целых чисел.']})
+        if any(not 0 < pk <= self.max_id for pk in ids):
+            raise ValidationError({'ids': [
+                'Ожидается список целых положительных чисел не больше '
+                f'{self.max_id}.'
+            ]})
+        if len(ids) > self.batch_max_ids:
+            raise ValidationError({'ids': [
+                f'За один запрос можно получить не больше '
+                f'{self.batch_max_ids} произведений.'
+            ]})
+        titles = self.get_queryset().in_bulk(ids)
+        return Response({
+            'results': self.get_serializer(
+                [titles[pk] for pk in ids if pk in titles], many=True
+            ).data,
+            'missing': [pk for pk in ids if pk not in titles],
+        })
+
+    @action(methods=['POST'], detail=False, url_path='bulk')
+    @serialized_write
+    def bulk_create(self, request):
+        """
+        Создаёт произведения из списка. Корректные элементы сохраняются
+        в одной транзакции, ошибки возвращаются по индексам элементов.
+        """
+        items = self.get_bulk_items(request)
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+        titles = bulk_create_titles(valid) if valid else []
+        return self.get_bulk_response(titles, errors, status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    @serialized_write
+    def bulk_update(self, request):
+        """
+        Частично обновляет произведения из списка; каждый элемент
+        содержит id произведения.
+        """
+        items = self.get_bulk_items(request)
+        ids = [self.get_bulk_id(item) for item in items]
+        instances = Title.objects.in_bulk([pk for pk in ids if pk is not None])
+        valid, errors, seen = [], [], set()
+        for index, (item, pk) in enumerate(zip(items, ids)):
+            if pk is None:
+                errors.append({'index': index, 'errors': {'id': [
+                    'Ожидается целое положительное число.'
+                ]}})
+                continue
+            if pk not in instances or pk in seen:
+                errors.append({'index': index, 'errors': {'id': [
+                    'Произведение не найдено.' if pk not in instances
+                    else 'Произведение указано несколько раз.'
+                ]}})
+                continue
+            seen.add(pk)
+            serializer = self.get_serializer(
+                instances[pk], data=item, partial=True
+            )
+            if serializer.is_valid():
+                valid.append((instances[pk], serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+        titles = bulk_update_titles(valid) if valid else []
+        return self.get_bulk_response(titles, errors, status.HTTP_200_OK)
+
+    def get_bulk_id(self, item):
+        """
+        Возвращает id произведения из элемента списка или None, если id
+        не целое число (в том числе bool) или не помещается в столбец id.
+        """
+        pk = item.get('id') if isinstance(item, dict) else None
+        if type(pk) is int and 0 < pk <= self.max_id:
+            return pk
+        return None
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается список произведений.'
+                ]
+            })
+        if len(items) > self.bulk_max_items:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'За один запрос можно передать не больше '
+                    f'{self.bulk_max_items} произведений.'
+                ]
+            })
+        return items
+
+    def get_bulk_response(self, titles, errors, success_status):
+        """
+        Возвращает сохранённые произведения в порядке запроса,
+        загружая их фиксированным числом запросов, и ошибки элементов.
+        """
+        loaded = self.get_queryset().in_bulk([title.pk for title in titles])
+        results = TitleViewingSerializer(
+            [loaded[title.pk] for title in titles], many=True,
+            context=self.get_serializer_context()
+        ).data
+        return Response(
+            {'results': results, 'errors': errors},
+            status=success_status if titles else status.HTTP_400_BAD_REQUEST
+        )
+
 
 class ReviewViewSet(AbstractReviewCommentViewSet):
     """Представление для обработки запросов к отзывам на заголовки."""
     serializer_class = ReviewSerializer
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(title=self.get_title(), author=self.request.user)
+        serializer.save(
+            title_id=self.kwargs.get('title_id'), author=self.request.user
+        )
 
 
 class CommentViewSet(AbstractReviewCommentViewSet):
@@ -95,13 +285,15 @@ class CommentViewSet(AbstractReviewCommentViewSet):
     serializer_class = CommentSerializer
 
     def get_review(self):
-        return get_object_or_404(
-            Review, pk=self.kwargs.get('review_id'),
-            title_id=self.kwargs.get('title_id')
-        )
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review, pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id')
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related('author')
 
     def perform_create(self, serializer):
         serializer.save(review=self.get_review(), author=self.request.user)
@@ -115,9 +307,10 @@ class SignUpView(APIView):
         """Обрабатывает POST-запрос для регистрации пользователя."""
         serializer = UserRegistrationSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        confirmation_code = default_token_generator.make_token(user)
-        send_confirmation_code(user, confirmation_code)
+        with transaction.atomic():
+            user = serializer.save()
+            confirmation_code = default_token_generator.make_token(user)
+            send_confirmation_code(user, confirmation_code)
         return Response(request.data, status=status.HTTP_200_OK)
 
 
@@ -127,7 +320,19 @@ class TokenView(TokenViewBase):
     serializer_class = TokenSerializer
 
 
-class UserListViewSet(viewsets.ModelViewSet):
+class MetricsView(APIView):
+    """Счётчики запросов в формате Prometheus для администраторов."""
+    permission_classes = (IsAuthenticated, IsAdmin)
+    renderer_classes = (PrometheusRenderer,)
+
+    def get(self, request):
+        return Response(
+            get_registry().render(),
+            content_type=f'{PROMETHEUS_CONTENT_TYPE}; charset=utf-8'
+        )
+
+
+class UserListViewSet(SerializedWriteMixin, viewsets.ModelViewSet):
     '''Вьюсет для пользователя'''
     queryset = YamdbUser.objects.all()
     serializer_class = AuthUserSerializer
@@ -145,13 +350,15 @@ class UserListViewSet(viewsets.ModelViewSet):
     )
     def get_current_user_info(self, request):
         return Response(
-            self.get_serializer(request.user).data, status=status.HTTP_200_OK
+            self.get_serializer(load_user(request.user)).data,
+            status=status.HTTP_200_OK
         )
 
     @get_current_user_info.mapping.patch
+    @serialized_write
     def update_current_user_info(self, request):
         serializer = self.get_serializer(
-            request.user,
+            load_user(request.user),
             data=request.data,
             partial=True
         )
@@ -1,12 +1,55 @@
+from functools import partial, wraps
+
 from rest_framework import viewsets
 
+from api_yamdb.sqlite.writes import run_serialized
+
+from .pagination import KeysetPagination
 from .permissions import IsAuthorOrModeratorAndAdmin
 
 
-class AbstractReviewCommentViewSet(viewsets.ModelViewSet):
+def serialized_write(method):
+    """
+    Декоратор дополнительных действий вьюсета, изменяющих данные:
+    выполняет действие через run_serialized, как SerializedWriteMixin.
+    """
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        return run_serialized(partial(method, self, request, *args, **kwargs))
+
+    return wrapper
+
+
+class SerializedWriteMixin:
+    """
+    Выполняет создание, изменение и удаление через run_serialized:
+    в одной транзакции, по очереди внутри процесса и с повтором
+    при блокировке базы другим процессом.
+    """
+
+    def create(self, request, *args, **kwargs):
+        return run_serialized(
+            partial(super().create, request, *args, **kwargs)
+        )
+
+    def update(self, request, *args, **kwargs):
+        return run_serialized(
+            partial(super().update, request, *args, **kwargs)
+        )
+
+    def destroy(self, request, *args, **kwargs):
+        return run_serialized(
+            partial(super().destroy, request, *args, **kwargs)
+        )
+
+
+class AbstractReviewCommentViewSet(SerializedWriteMixin,
+                                   viewsets.ModelViewSet):
     """
     Абстрактная Класс представления для работы комментариев, отзыв.
     Поддерживает методы GET, POST, PATCH и DELETE.
     """
     permission_classes = (IsAuthorOrModeratorAndAdmin,)
+    pagination_class = KeysetPagination
     http_method_names = ('get', 'post', 'patch', 'delete')
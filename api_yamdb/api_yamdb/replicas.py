@@ -0,0 +1,93 @@
+import random
+from contextvars import ContextVar
+from hashlib import sha1
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from api_yamdb.settings import (
+    DATABASE_REPLICAS, REPLICA_READ_YOUR_WRITES_WINDOW
+)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+RECENT_WRITER_KEY = 'replica-recent-writer:{client}'
+
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+class PrimaryReplicaRouter:
+    """
+    Отправляет чтение на случайную реплику из DATABASE_REPLICAS, если
+    текущий запрос это разрешил (см. ReplicaRoutingMiddleware), а запись,
+    чтение внутри транзакции и всё вне HTTP-запросов - в основную базу.
+    Реплики - копии основной базы, поэтому связи между ними разрешены,
+    а миграции применяются только к основной базе.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            DATABASE_REPLICAS and replica_reads.get()
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return random.choice(DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def get_client_key(request):
+    """
+    Ключ клиента для чтения своих записей: токен из заголовка
+    Authorization, а для анонимных запросов - адрес клиента.
+    """
+    client = request.META.get('HTTP_AUTHORIZATION') or request.META.get(
+        'REMOTE_ADDR', ''
+    )
+    return RECENT_WRITER_KEY.format(
+        client=sha1(client.encode()).hexdigest()
+    )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Разрешает чтение с реплик для безопасных запросов. Клиент, который
+    недавно что-то изменил, ещё REPLICA_READ_YOUR_WRITES_WINDOW секунд
+    читает из основной базы, чтобы видеть свои изменения до синхронизации
+    реплик.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = get_client_key(request)
+        safe = request.method in SAFE_METHODS
+        token = replica_reads.set(safe and cache.get(key) is None)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        if not safe:
+            cache.set(key, True, REPLICA_READ_YOUR_WRITES_WINDOW)
+        return response
+
+
+def sync_replicas(aliases=None):
+    """
+    Копирует основную базу SQLite в реплики через backup API.
+    Копирование идёт поверх файла реплики, поэтому открытые соединения
+    с ней сразу видят новые данные.
+    """
+    primary = connections[DEFAULT_DB_ALIAS]
+    primary.ensure_connection()
+    for alias in DATABASE_REPLICAS if aliases is None else aliases:
+        replica = connections[alias]
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
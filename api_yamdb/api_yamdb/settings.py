@@ -1,3 +1,4 @@
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -23,7 +24,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.timing.ServerTimingMiddleware',
+    'api_yamdb.replicas.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -54,13 +58,52 @@ TEMPLATES = [
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'api_yamdb.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': None,
+        'OPTIONS': {
+            'pragmas': SQLITE_PRAGMAS,
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Реплики для чтения, например ('replica',). Файлы реплик обновляет
+# команда sync_replicas.
+DATABASE_REPLICAS = ()
+DATABASES.update({
+    alias: dict(
+        DATABASES['default'],
+        NAME=BASE_DIR / f'db.{alias}.sqlite3',
+        TEST={'MIRROR': 'default'},
+    )
+    for alias in DATABASE_REPLICAS
+})
+DATABASE_ROUTERS = ['api_yamdb.replicas.PrimaryReplicaRouter']
+REPLICA_SYNC_INTERVAL = 30
+# Время, за которое sync_replicas должна успевать скопировать базу.
+REPLICA_SYNC_MAX_DURATION = 10
+# Реплика отстаёт от основной базы не больше чем на интервал
+# синхронизации и время копирования, поэтому окно чтения своих записей
+# не может быть короче.
+REPLICA_READ_YOUR_WRITES_WINDOW = (
+    REPLICA_SYNC_INTERVAL + REPLICA_SYNC_MAX_DURATION
+)
+
+SQLITE_WRITE_ATTEMPTS = 5
+SQLITE_WRITE_RETRY_DELAY = 0.05
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -101,20 +144,77 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.CachedCountPageNumberPagination',
     'PAGE_SIZE': 5,
 }
 
 
+# Кэш общий для всех процессов сервиса на одной машине: через него
+# процессы узнают об изменении справочников, отзыве токенов и недавних
+# записях клиента. При нескольких машинах нужен Redis или Memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': Path(tempfile.gettempdir()) / 'api_yamdb_cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+REFERENCE_CACHE_CHECK_INTERVAL = 1
+REFERENCE_CACHE_TIMEOUT = 300
+
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 100_000
+
+
 SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+JWT_USER_STATE_CACHE_TIMEOUT = 30
+
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 DEFAULT_FROM_EMAIL = 'a@yambd.face'
 
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = 60
+OUTBOX_LEASE_TIMEOUT = 300
+OUTBOX_POLL_INTERVAL = 5
+OUTBOX_MAX_BACKOFF = 300
+
 USER_URL_PATH_NAME = 'me'
+
+# Доля запросов, для которых считаются SQL-запросы и время сериализации
+# (заголовок Server-Timing и строка в логе api.timing).
+SERVER_TIMING_SAMPLE_RATE = 1.0 if DEBUG else 0.01
+
+# Файлы счётчиков процессов для /api/v1/metrics/. Каталог общий для
+# всех процессов сервиса и очищается при развёртывании.
+METRICS_DIR = Path(tempfile.gettempdir()) / 'api_yamdb_metrics'
+METRICS_FLUSH_INTERVAL = 15
+METRICS_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+
+# Контрольные точки и отклонённые строки csv_importer. Хранятся вне
+# папки с данными, чтобы импорт не оставлял файлов в репозитории.
+CSV_IMPORT_WORK_DIR = Path(tempfile.gettempdir()) / 'api_yamdb_import'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
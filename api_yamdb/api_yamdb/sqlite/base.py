@@ -0,0 +1,30 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite с настройками из OPTIONS:
+    pragmas - словарь PRAGMA, которые выполняются при открытии соединения;
+    transaction_mode - режим BEGIN для transaction.atomic (DEFERRED,
+    IMMEDIATE или EXCLUSIVE). В режиме IMMEDIATE транзакция сразу берёт
+    блокировку записи и ждёт её по busy_timeout, а не падает с
+    "database is locked" при попытке начать запись после чтения.
+    """
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = kwargs.pop('pragmas', {})
+        self.transaction_mode = kwargs.pop('transaction_mode', None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
+        else:
+            super()._start_transaction_under_autocommit()
@@ -0,0 +1,40 @@
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.db import (
+    DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+)
+
+from api_yamdb.settings import SQLITE_WRITE_ATTEMPTS, SQLITE_WRITE_RETRY_DELAY
+
+write_locks = defaultdict(threading.RLock)
+
+
+def is_locked_error(error):
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+def run_serialized(func, using=DEFAULT_DB_ALIAS,
+                   attempts=SQLITE_WRITE_ATTEMPTS,
+                   delay=SQLITE_WRITE_RETRY_DELAY):
+    """
+    Выполняет func в транзакции, по одной записи на процесс для каждой
+    базы SQLite. Потоки процесса не соревнуются за блокировку файла,
+    а ошибка "database is locked" из-за других процессов повторяется
+    с экспоненциально растущей случайной задержкой. Внутри внешней
+    транзакции повтор невозможен, поэтому func просто выполняется.
+    """
+    connection = connections[using]
+    if connection.in_atomic_block or connection.vendor != 'sqlite':
+        with transaction.atomic(using=using):
+            return func()
+    for attempt in range(attempts):
+        try:
+            with write_locks[using], transaction.atomic(using=using):
+                return func()
+        except OperationalError as error:
+            if not is_locked_error(error) or attempt == attempts - 1:
+                raise
+        time.sleep(delay * 2 ** attempt * random.uniform(0.5, 1.5))
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Genre, Review, Title, YamdbUser
+from .models import (
+    Category, Comment, Genre, OutboxEmail, Review, Title, YamdbUser
+)
 
 
 @admin.register(YamdbUser)
@@ -28,6 +30,7 @@ class TitleAdmin(admin.ModelAdmin):
         'year',
         'description',
         'category',
+        'rating',
     )
 
 
@@ -47,3 +50,17 @@ class CategoryAdmin(admin.ModelAdmin):
         'name',
         'slug'
     )
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'recipient',
+        'subject',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'last_error',
+    )
+    list_filter = ('status',)
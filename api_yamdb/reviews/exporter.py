@@ -0,0 +1,100 @@
+import csv
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.importer import CSV_TABLES
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def format_csv_value(value):
+    """Приводит значение к строке, которую примет csv_importer."""
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class CsvRowWriter:
+
+    def __init__(self, file, columns):
+        self.writer = csv.writer(file)
+        self.writer.writerow(columns)
+
+    def write(self, values):
+        self.writer.writerow([format_csv_value(value) for value in values])
+
+
+class NdjsonRowWriter:
+
+    def __init__(self, file, columns):
+        self.file = file
+        self.columns = columns
+        self.encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    def write(self, values):
+        self.file.write(self.encoder.encode(dict(zip(self.columns, values))))
+        self.file.write('\n')
+
+
+ROW_WRITERS = {'csv': CsvRowWriter, 'ndjson': NdjsonRowWriter}
+
+
+class DataExporter:
+    """
+    Потоковая выгрузка таблиц в csv или ndjson. Строки читаются из базы
+    через iterator(chunk_size) и сразу пишутся в файл, поэтому расход
+    памяти не зависит от размера таблиц. csv-файлы совпадают по именам
+    и столбцам с файлами csv_importer и загружаются им обратно.
+    """
+
+    def __init__(self, output_dir, export_format='csv',
+                 chunk_size=DEFAULT_CHUNK_SIZE, stdout=None):
+        self.output_dir = Path(output_dir)
+        self.export_format = export_format
+        self.chunk_size = chunk_size
+        self.stdout = stdout
+
+    def run(self, tables=CSV_TABLES):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for table in tables:
+            self.export_table(table)
+
+    def export_table(self, table):
+        started = time.monotonic()
+        model = table.model
+        attnames = [
+            model._meta.get_field(table.columns.get(column, column)).attname
+            for column in table.export_columns
+        ]
+        rows = model.objects.order_by('pk').values_list(*attnames).iterator(
+            chunk_size=self.chunk_size
+        )
+        path = self.get_path(table)
+        count = 0
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            writer = ROW_WRITERS[self.export_format](
+                file, table.export_columns
+            )
+            for values in rows:
+                writer.write(values)
+                count += 1
+        elapsed = time.monotonic() - started
+        self.write(
+            f'{path.name}: строк {count}, '
+            f'{count / max(elapsed, 1e-9):.0f} строк/с.'
+        )
+
+    def get_path(self, table):
+        return self.output_dir / (
+            f'{Path(table.filename).stem}.{self.export_format}'
+        )
+
+    def write(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
@@ -0,0 +1,717 @@
+import csv
+import json
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from hashlib import md5
+from pathlib import Path
+
+import django
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError as DRFValidationError
+
+from api_yamdb.settings import CSV_IMPORT_WORK_DIR
+from reviews.models import (
+    Category, Comment, Genre, ImportedRowHash, Review, Title, YamdbUser,
+    fold_name
+)
+from reviews.reference_cache import get_reference_cache
+from reviews.search import (
+    index_titles, is_search_index_supported, rebuild_search_index
+)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_CHECKPOINT_NAME = 'csv_importer.checkpoint.json'
+DEFAULT_REJECTS_DIR_NAME = 'rejects'
+
+
+def get_work_dir(data_dir):
+    """
+    Папка контрольной точки и отклонённых строк для папки данных
+    в CSV_IMPORT_WORK_DIR: у каждой папки данных своя подпапка.
+    """
+    digest = md5(str(Path(data_dir).resolve()).encode('utf-8')).hexdigest()
+    return Path(CSV_IMPORT_WORK_DIR) / digest[:12]
+
+
+class CsvTable:
+    """
+    Описание csv-файла для импорта.
+    columns сопоставляет столбцы файла с именами атрибутов модели, если
+    они различаются; foreign_keys - атрибуты внешних ключей и их модели;
+    unique_by - атрибуты, по которым повторяющиеся строки отбрасываются
+    (столбец id для таких таблиц не используется); export_columns -
+    столбцы файла при выгрузке командой csv_exporter.
+    """
+
+    def __init__(self, filename, model, columns=None, foreign_keys=None,
+                 unique_by=None, export_columns=()):
+        self.filename = filename
+        self.model = model
+        self.columns = columns or {}
+        self.foreign_keys = foreign_keys or {}
+        self.unique_by = unique_by
+        self.export_columns = export_columns
+
+    def __str__(self):
+        return self.filename
+
+    @property
+    def key_columns(self):
+        """Столбцы файла, по которым строка сопоставляется с записью."""
+        if not self.unique_by:
+            return ('id',)
+        columns = {name: column for column, name in self.columns.items()}
+        return tuple(columns.get(name, name) for name in self.unique_by)
+
+    def get_update_fields(self, fieldnames):
+        """Поля модели, которые обновляются из столбцов файла."""
+        model = self.model
+        fields = [
+            model._meta.get_field(self.columns.get(column, column)).attname
+            for column in fieldnames if column != 'id'
+        ]
+        if hasattr(model, 'name_folded'):
+            fields.append('name_folded')
+        return fields
+
+
+CSV_TABLES = (
+    CsvTable(
+        'category.csv', Category,
+        export_columns=('id', 'name', 'slug'),
+    ),
+    CsvTable(
+        'genre.csv', Genre,
+        export_columns=('id', 'name', 'slug'),
+    ),
+    CsvTable(
+        'titles.csv', Title,
+        columns={'category': 'category_id'},
+        foreign_keys={'category_id': Category},
+        export_columns=(
+            'id', 'name', 'year', 'category', 'description', 'rating'
+        ),
+    ),
+    CsvTable(
+        'genre_title.csv', Title.genre.through,
+        foreign_keys={'title_id': Title, 'genre_id': Genre},
+        unique_by=('title_id', 'genre_id'),
+        export_columns=('id', 'title_id', 'genre_id'),
+    ),
+    CsvTable(
+        'users.csv', YamdbUser,
+        export_columns=(
+            'id', 'username', 'email', 'role', 'bio', 'first_name',
+            'last_name',
+        ),
+    ),
+    CsvTable(
+        'review.csv', Review,
+        columns={'author': 'author_id'},
+        foreign_keys={'title_id': Title, 'author_id': YamdbUser},
+        export_columns=(
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+        ),
+    ),
+    CsvTable(
+        'comments.csv', Comment,
+        columns={'author': 'author_id'},
+        foreign_keys={'review_id': Review, 'author_id': YamdbUser},
+        export_columns=('id', 'review_id', 'text', 'author', 'pub_date'),
+    ),
+)
+
+
+def get_csv_table(filename):
+    return next(table for table in CSV_TABLES if table.filename == filename)
+
+
+class RowError(Exception):
+    """Строка csv-файла не прошла проверку."""
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """
+    Временно отключает auto_now_add у полей модели, чтобы при импорте
+    сохранились даты из файла.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def clean_value(field, value):
+    """Приводит строку из файла к значению поля и проверяет его."""
+    if value == '' and field.null:
+        return None
+    value = field.to_python(value)
+    if field.choices and value not in dict(field.flatchoices):
+        raise ValidationError(f'Недопустимое значение {value!r}.')
+    field.run_validators(value)
+    return value
+
+
+def describe_error(error):
+    if isinstance(error, ValidationError):
+        return ' '.join(error.messages)
+    if isinstance(error, DRFValidationError):
+        return ' '.join(map(str, error.detail))
+    return str(error)
+
+
+def clean_row(table, row):
+    """
+    Приводит строку файла к значениям полей модели и проверяет их.
+    Не обращается к базе, поэтому выполняется в процессах-обработчиках.
+    """
+    model = table.model
+    if None in row or None in row.values():
+        raise RowError('Количество значений не совпадает с заголовком.')
+    values = {}
+    try:
+        for column, raw_value in row.items():
+            if table.unique_by and column == 'id':
+                continue
+            name = table.columns.get(column, column)
+            field = model._meta.get_field(name)
+            values[field.attname] = clean_value(field, raw_value)
+    except Exception as error:
+        raise RowError(describe_error(error)) from error
+    if hasattr(model, 'name_folded'):
+        values['name_folded'] = fold_name(values.get('name') or '')
+    return values
+
+
+def clean_chunk(filename, rows):
+    """
+    Проверяет пачку строк файла filename в процессе-обработчике.
+    Возвращает для каждой строки пару (значения, None) или
+    (None, текст ошибки).
+    """
+    table = get_csv_table(filename)
+    results = []
+    for _, row in rows:
+        try:
+            results.append((clean_row(table, row), None))
+        except RowError as error:
+            results.append((None, str(error)))
+    return results
+
+
+def build_instance(table, values, known_ids):
+    """
+    Строит объект модели из проверенных значений без запросов к базе.
+    Существование внешних ключей проверяется по множествам known_ids.
+    """
+    for attname, related_model in table.foreign_keys.items():
+        value = values.get(attname)
+        if value is not None and value not in known_ids(related_model):
+            raise RowError(
+                f'{related_model._meta.verbose_name} с id={value} '
+                'не существует.'
+            )
+    return table.model(**values)
+
+
+def row_key(table, row):
+    return ','.join(str(row.get(column)) for column in table.key_columns)
+
+
+def row_digest(table, row):
+    """Хэш значений строки без столбца id, если он не используется."""
+    values = [
+        value for column, value in row.items()
+        if not (table.unique_by and column == 'id')
+    ]
+    return md5(
+        json.dumps(values, ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+
+
+def after_import(model, using='default'):
+    """Обновляет производные данные, которые bulk_create не трогает."""
+    if model is Review:
+        Title.objects.using(using).all().recalculate_rating()
+    elif model is Title and is_search_index_supported(using):
+        rebuild_search_index(using)
+    elif model in (Category, Genre):
+        get_reference_cache(model).invalidate()
+
+
+def after_sync(model, title_ids, using='default'):
+    """
+    Обновляет производные данные после синхронизации только для
+    затронутых ею произведений title_ids.
+    """
+    titles = Title.objects.using(using).filter(pk__in=title_ids)
+    if model is Review:
+        titles.recalculate_rating()
+    elif model is Title:
+        index_titles(list(titles), using)
+    elif model in (Category, Genre):
+        get_reference_cache(model).invalidate()
+
+
+class CheckpointError(Exception):
+    """Контрольная точка не относится к импортируемым файлам."""
+
+
+class ImportCheckpoint:
+    """
+    Контрольная точка импорта в json-файле: имя csv-файла, смещение
+    в байтах после последней закоммиченной строки, номер этой строки
+    и размер файла отклонённых строк на тот же момент.
+    Файл перезаписывается атомарно после каждой пачки.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def load(self):
+        if not self.path.exists():
+            return None
+        return json.loads(self.path.read_text(encoding='utf-8'))
+
+    def save(self, filename, offset=None, line=None, rejects_offset=None,
+             done=False):
+        state = {
+            'filename': filename, 'offset': offset, 'line': line,
+            'rejects_offset': rejects_offset, 'done': done,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        temp_path.write_text(json.dumps(state), encoding='utf-8')
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+class RejectsWriter:
+    """
+    Пишет отклонённые строки в csv-файл с исходными столбцами и текстом
+    ошибки. Файл создаётся при первой ошибке. При продолжении импорта
+    файл обрезается до размера из контрольной точки, чтобы строки
+    после неё не записались дважды.
+    """
+
+    def __init__(self, path, offset=None):
+        self.path = Path(path)
+        self.offset = offset
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        if self.path.exists():
+            if self.offset is None:
+                self.path.unlink()
+            else:
+                os.truncate(self.path, self.offset)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            self._file.close()
+
+    def write(self, fieldnames, row, error):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file)
+            if not self.path.stat().st_size:
+                self._writer.writerow([*fieldnames, 'error'])
+        self._writer.writerow(
+            [*(row.get(name) for name in fieldnames), error]
+        )
+
+    def tell(self):
+        if self._file is not None:
+            self._file.flush()
+        return self.path.stat().st_size if self.path.exists() else 0
+
+
+def read_rows(file, fieldnames, line):
+    """
+    Читает записи csv из файла, открытого в двоичном режиме, и возвращает
+    тройки (строка, её номер, смещение в байтах после неё). С этого
+    смещения чтение можно продолжить через seek. Как и csv.DictReader,
+    лишние значения попадают под ключ None, а недостающие равны None.
+    """
+    offset = file.tell()
+
+    def lines():
+        nonlocal offset
+        for raw_line in file:
+            offset += len(raw_line)
+            yield raw_line.decode('utf-8')
+
+    for values in csv.reader(lines()):
+        if not values:
+            continue
+        line += 1
+        row = dict(zip(fieldnames, values))
+        if len(values) > len(fieldnames):
+            row[None] = values[len(fieldnames):]
+        for name in fieldnames[len(values):]:
+            row[name] = None
+        yield row, line, offset
+
+
+class CsvImporter:
+    """
+    Потоковый импорт csv-файлов: строки читаются пачками по batch_size,
+    разбираются и проверяются в пуле из workers процессов, а вставляет
+    их единственный писатель - текущий процесс - в порядке зависимостей
+    таблиц. Каждая пачка вставляется через bulk_create в своей
+    транзакции, после чего сохраняется контрольная точка. Прерванный
+    импорт продолжается с неё при resume=True. Уже существующие записи
+    пропускаются, отклонённые строки пишутся в <файл>.rejects.csv
+    в папке rejects_dir.
+
+    При sync=True каждая строка сравнивается по ключу с хэшем из
+    ImportedRowHash: неизменённые строки не проверяются и не пишутся,
+    новые вставляются, изменённые обновляются, а записи, строк которых
+    в файле больше нет, удаляются. Прерванная синхронизация файла
+    начинается заново с его начала: уже записанные пачки совпадут
+    с хэшами и будут пропущены.
+    """
+
+    def __init__(self, data_dir, batch_size=DEFAULT_BATCH_SIZE,
+                 workers=DEFAULT_WORKERS, sync=False, checkpoint_path=None,
+                 rejects_dir=None, stdout=None, stderr=None):
+        self.data_dir = Path(data_dir)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.sync = sync
+        self.pool = None
+        work_dir = get_work_dir(self.data_dir)
+        self.checkpoint = ImportCheckpoint(
+            checkpoint_path or work_dir / DEFAULT_CHECKPOINT_NAME
+        )
+        self.rejects_dir = Path(
+            rejects_dir or work_dir / DEFAULT_REJECTS_DIR_NAME
+        )
+        self.stdout = stdout
+        self.stderr = stderr
+        self._known_ids = {}
+
+    def known_ids(self, model):
+        if model not in self._known_ids:
+            self._known_ids[model] = set(
+                model.objects.values_list('pk', flat=True)
+            )
+        return self._known_ids[model]
+
+    def run(self, tables=CSV_TABLES, resume=False):
+        state = self.checkpoint.load() if resume else None
+        filenames = [table.filename for table in tables]
+        if state is not None and state['filename'] not in filenames:
+            raise CheckpointError(
+                f'Файл {state["filename"]} из контрольной точки '
+                'не импортируется.'
+            )
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(
+                self.workers, initializer=django.setup
+            )
+        try:
+            for index, table in enumerate(tables):
+                start = None
+                if state is not None:
+                    position = filenames.index(state['filename'])
+                    if index < position or (
+                        index == position and state['done']
+                    ):
+                        self.write(f'{table}: уже импортирован, пропущен.')
+                        continue
+                    if index == position and not self.sync:
+                        start = state
+                self.import_table(table, start)
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown(cancel_futures=True)
+                self.pool = None
+        self.checkpoint.clear()
+
+    def import_table(self, table, start=None):
+        model = table.model
+        started = time.monotonic()
+        self.counts = Counter()
+        self.title_ids = set()
+        count_before = model.objects.count()
+        rejects = RejectsWriter(
+            self.rejects_path(table), start and start['rejects_offset']
+        )
+        with open(self.data_dir / table.filename, 'rb') as file, \
+                keep_auto_now_add(model), rejects:
+            header = file.readline()
+            fieldnames = next(csv.reader([header.decode('utf-8-sig')]))
+            line = 1
+            if start and start['offset']:
+                file.seek(start['offset'])
+                line = start['line']
+            chunks = self.read_chunks(file, fieldnames, line)
+            if self.sync:
+                stored = self.load_hashes(table)
+                chunks = self.changed_chunks(table, chunks, stored)
+            for (chunk, offset, line), results in self.clean_chunks(
+                table, chunks
+            ):
+                valid = self.build_chunk(
+                    table, fieldnames, chunk, results, rejects
+                )
+                if self.sync:
+                    self.write_changes(table, fieldnames, valid)
+                else:
+                    self.write_batch(model, self.deduplicate(table, valid))
+                self.checkpoint.save(
+                    table.filename, offset, line, rejects.tell()
+                )
+            if self.sync:
+                self.delete_missing(table, stored)
+                with transaction.atomic():
+                    after_sync(model, self.title_ids)
+            else:
+                with transaction.atomic():
+                    after_import(model)
+        self.checkpoint.save(table.filename, done=True)
+        self._known_ids.pop(model, None)
+        self.report_table(table, rejects, count_before, started)
+
+    def build_chunk(self, table, fieldnames, chunk, results, rejects):
+        """
+        Строит объекты из проверенных строк пачки. Отклонённые строки
+        выводятся в stderr и пишутся в rejects. Возвращает пары
+        (строка, объект).
+        """
+        valid = []
+        for (line, row), (values, message) in zip(chunk, results):
+            try:
+                if message is not None:
+                    raise RowError(message)
+                instance = build_instance(table, values, self.known_ids)
+            except RowError as error:
+                self.counts['errors'] += 1
+                self.report_error(table, line, row, error)
+                rejects.write(fieldnames, row, error)
+                continue
+            valid.append((row, instance))
+        return valid
+
+    def report_table(self, table, rejects, count_before, started):
+        model = table.model
+        counts = self.counts
+        elapsed = time.monotonic() - started
+        if self.sync:
+            changes = (
+                f'добавлено {counts["inserted"]}, '
+                f'изменено {counts["updated"]}, '
+                f'удалено {counts["deleted"]}, '
+                f'без изменений {counts["unchanged"]}'
+            )
+        else:
+            changes = f'добавлено {model.objects.count() - count_before}'
+        message = (
+            f'{table}: строк {counts["rows"]}, {changes}, '
+            f'ошибок {counts["errors"]}, '
+            f'{counts["rows"] / max(elapsed, 1e-9):.0f} строк/с.'
+        )
+        if counts['errors']:
+            message += f' Отклонённые строки: {rejects.path}.'
+        self.write(message)
+
+    def read_chunks(self, file, fieldnames, line):
+        """
+        Делит записи файла на пачки по batch_size. Для каждой пачки
+        возвращает список пар (номер строки, строка), смещение в байтах
+        после пачки и номер её последней строки.
+        """
+        chunk = []
+        for row, line, offset in read_rows(file, fieldnames, line):
+            self.counts['rows'] += 1
+            chunk.append((line, row))
+            if len(chunk) >= self.batch_size:
+                yield chunk, offset, line
+                chunk = []
+        if chunk:
+            yield chunk, offset, line
+
+    def load_hashes(self, table):
+        return dict(ImportedRowHash.objects.filter(
+            filename=table.filename
+        ).values_list('key', 'digest').iterator())
+
+    def changed_chunks(self, table, chunks, stored):
+        """
+        Оставляет в пачках только новые и изменённые строки. Ключи
+        найденных строк удаляются из stored, поэтому после чтения файла
+        в нём остаются только строки, которых в файле больше нет.
+        """
+        for chunk, offset, line in chunks:
+            changed = []
+            for row_line, row in chunk:
+                digest = stored.pop(row_key(table, row), None)
+                if digest == row_digest(table, row):
+                    self.counts['unchanged'] += 1
+                else:
+                    changed.append((row_line, row))
+            yield changed, offset, line
+
+    def clean_chunks(self, table, chunks):
+        """
+        Проверяет пачки в пуле процессов и возвращает их результаты
+        в исходном порядке. В обработке одновременно находится не больше
+        двух пачек на процесс, чтобы чтение файла не опережало запись.
+        """
+        if self.pool is None:
+            for chunk in chunks:
+                yield chunk, clean_chunk(table.filename, chunk[0])
+            return
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, self.pool.submit(
+                clean_chunk, table.filename, chunk[0]
+            )))
+            if len(pending) >= self.workers * 2:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+    def deduplicate(self, table, valid):
+        """Отбрасывает повторы строк внутри пачки для таблиц unique_by."""
+        if not table.unique_by:
+            return [instance for _, instance in valid]
+        batch = {}
+        for _, instance in valid:
+            key = tuple(getattr(instance, name) for name in table.unique_by)
+            batch.setdefault(key, instance)
+        return list(batch.values())
+
+    def write_changes(self, table, fieldnames, valid):
+        """
+        Вставляет новые и обновляет изменённые записи пачки вместе
+        с их хэшами в одной транзакции. Записи, значения которых уже
+        совпадают с базой (например, при первой синхронизации после
+        обычного импорта), не обновляются.
+        """
+        model = table.model
+        known_ids = self.known_ids(model)
+        inserts, updates, hashes = [], [], {}
+        for row, instance in valid:
+            if table.unique_by or instance.pk not in known_ids:
+                inserts.append(instance)
+            else:
+                updates.append(instance)
+            key = row_key(table, row)
+            hashes[key] = ImportedRowHash(
+                filename=table.filename, key=key, digest=row_digest(table, row)
+            )
+        if model is Review:
+            self.title_ids.update(instance.title_id for _, instance in valid)
+        elif model is Title:
+            self.title_ids.update(instance.pk for _, instance in valid)
+        update_fields = table.get_update_fields(fieldnames)
+        with transaction.atomic():
+            updates = self.select_changed(model, updates, update_fields)
+            model.objects.bulk_create(
+                inserts, batch_size=self.batch_size, ignore_conflicts=True
+            )
+            if updates:
+                model.objects.bulk_update(
+                    updates, update_fields, batch_size=self.batch_size
+                )
+            ImportedRowHash.objects.filter(
+                filename=table.filename, key__in=list(hashes)
+            ).delete()
+            ImportedRowHash.objects.bulk_create(
+                hashes.values(), batch_size=self.batch_size
+            )
+        known_ids.update(instance.pk for instance in inserts)
+        self.counts['inserted'] += len(inserts)
+        self.counts['updated'] += len(updates)
+
+    def select_changed(self, model, instances, fields):
+        """Отбирает объекты, значения полей которых отличаются от базы."""
+        if not instances:
+            return instances
+        current = model.objects.in_bulk([obj.pk for obj in instances])
+        changed = []
+        for instance in instances:
+            previous = current.get(instance.pk)
+            if previous is not None and all(
+                getattr(instance, name) == getattr(previous, name)
+                for name in fields
+            ):
+                self.counts['unchanged'] += 1
+                continue
+            if model is Review and previous is not None:
+                self.title_ids.add(previous.title_id)
+            changed.append(instance)
+        return changed
+
+    def delete_missing(self, table, stored):
+        """
+        Удаляет записи, строк которых больше нет в файле, вместе с их
+        хэшами. Удаление идёт через ORM, поэтому каскады и сигналы
+        (рейтинг, поисковый индекс) отрабатывают как обычно.
+        """
+        model = table.model
+        keys = list(stored)
+        for index in range(0, len(keys), self.batch_size):
+            part = keys[index:index + self.batch_size]
+            if table.unique_by:
+                condition = Q()
+                for key in part:
+                    condition |= Q(**dict(
+                        zip(table.unique_by, key.split(','))
+                    ))
+            else:
+                condition = Q(pk__in=part)
+            with transaction.atomic():
+                _, deleted = model.objects.filter(condition).delete()
+                ImportedRowHash.objects.filter(
+                    filename=table.filename, key__in=part
+                ).delete()
+            self.counts['deleted'] += deleted.get(model._meta.label, 0)
+
+    def rejects_path(self, table):
+        return self.rejects_dir / f'{Path(table.filename).stem}.rejects.csv'
+
+    def write_batch(self, model, batch):
+        """
+        Вставляет пачку в отдельной транзакции. Повторная вставка той же
+        пачки после сбоя безопасна: конфликтующие строки пропускаются.
+        """
+        if batch:
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    batch, batch_size=self.batch_size, ignore_conflicts=True
+                )
+
+    def report_error(self, table, line, row, error):
+        if self.stderr is not None:
+            self.stderr.write(
+                f'{table}, строка {line} (id={row.get("id")}): {error}'
+            )
+
+    def write(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from reviews.exporter import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, DataExporter
+
+
+class Command(BaseCommand):
+    """
+    Команда для выгрузки базы в csv или ndjson.
+    Вызов python manage.py csv_exporter
+    из терминала в соответствующей папке.
+    """
+
+    help = 'Выгрузка таблиц базы в csv или ndjson файлы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir', default='export',
+            help='Папка для выгружаемых файлов.'
+        )
+        parser.add_argument(
+            '--format', dest='export_format', choices=EXPORT_FORMATS,
+            default='csv', help='Формат файлов.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один раз.'
+        )
+
+    def handle(self, *args, **options):
+        DataExporter(
+            options['output_dir'],
+            export_format=options['export_format'],
+            chunk_size=options['chunk_size'],
+            stdout=self.stdout,
+        ).run()
@@ -1,17 +1,8 @@
-import csv
+from django.core.management.base import BaseCommand, CommandError
 
-from django.core.management.base import BaseCommand
-from reviews.models import Category, Comment, Genre, Review, Title, YamdbUser
-
-
-model_csv_equal = {
-    'static/data/category.csv': Category,
-    'static/data/genre.csv': Genre,
-    'static/data/titles.csv': Title,
-    'static/data/users.csv': YamdbUser,
-    'static/data/review.csv': Review,
-    'static/data/comments.csv': Comment,
-}
+from reviews.importer import (
+    DEFAULT_BATCH_SIZE, DEFAULT_WORKERS, CheckpointError, CsvImporter
+)
 
 
 class Command(BaseCommand):
@@ -23,37 +14,52 @@ class Command(BaseCommand):
 
     help = 'Импорт csv файлов в таблицы базы.'
 
-    def _create_correct_row_fields(self, row):
-        """Дополняет строку таблицы экземплярами модели."""
-
-        try:
-            if row.get('author'):
-                row['author'] = YamdbUser.objects.get(pk=row['author'])
-            if row.get('review_id'):
-                row['review'] = Review.objects.get(pk=row['review_id'])
-            if row.get('title_id'):
-                row['title'] = Title.objects.get(pk=row['title_id'])
-            if row.get('category'):
-                row['category'] = Category.objects.get(pk=row['category'])
-            if row.get('genre'):
-                row['genre'] = Genre.objects.get(pk=row['genre'])
-        except Exception as error:
-            print(f'Ошибка в строке {row.get("id")}.\n'
-                  f'Текст - {error}')
-        return row
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir', default='static/data',
+            help='Папка с csv-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одной пачке и одной транзакции.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=DEFAULT_WORKERS,
+            help='Количество процессов для разбора и проверки строк '
+                 '(по умолчанию - число ядер).'
+        )
+        parser.add_argument(
+            '--sync', action='store_true',
+            help='Синхронизировать базу с файлами: записать только новые '
+                 'и изменённые строки и удалить отсутствующие в файлах.'
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Продолжить прерванный импорт с контрольной точки.'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл контрольной точки (по умолчанию '
+                 'csv_importer.checkpoint.json в CSV_IMPORT_WORK_DIR).'
+        )
+        parser.add_argument(
+            '--rejects-dir',
+            help='Папка для отклонённых строк '
+                 '(по умолчанию rejects в CSV_IMPORT_WORK_DIR).'
+        )
 
     def handle(self, *args, **options):
-        for i in model_csv_equal.items():
-            path, model = i
-            rows = 0
-
-            with open(path, encoding='utf-8', mode='r') as file:
-                csv_read = csv.DictReader(file)
-                for row in csv_read:
-                    rows += 1
-                    row = self._create_correct_row_fields(row)
-                    try:
-                        model.objects.get_or_create(**row)
-                    except Exception as error:
-                        print(f'Ошибка в строке {row.get("id")}.\n'
-                              f'Текст - {error}')
+        importer = CsvImporter(
+            options['data_dir'],
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            sync=options['sync'],
+            checkpoint_path=options['checkpoint'],
+            rejects_dir=options['rejects_dir'],
+            stdout=self.stdout,
+            stderr=self.stderr,
+        )
+        try:
+            importer.run(resume=options['resume'])
+        except CheckpointError as error:
+            raise CommandError(error)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    """
+    Команда для пересчёта хранимого рейтинга произведений.
+    Вызов python manage.py rebuild_ratings
+    из терминала в соответствующей папке.
+    """
+
+    help = 'Пересчёт суммы оценок, количества отзывов и рейтинга произведений.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Title.objects.all().recalculate_rating()
+        self.stdout.write(f'Пересчитан рейтинг произведений: {updated}.')
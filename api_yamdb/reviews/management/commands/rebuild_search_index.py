@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.search import is_search_index_supported, rebuild_search_index
+
+
+class Command(BaseCommand):
+    """
+    Команда для перестроения полнотекстового индекса произведений.
+    Вызов python manage.py rebuild_search_index
+    из терминала в соответствующей папке.
+    """
+
+    help = 'Перестроение полнотекстового индекса произведений.'
+
+    def handle(self, *args, **options):
+        if not is_search_index_supported():
+            raise CommandError(
+                'Полнотекстовый индекс поддерживается только для SQLite.'
+            )
+        rebuild_search_index()
+        self.stdout.write('Полнотекстовый индекс произведений перестроен.')
@@ -0,0 +1,78 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api_yamdb.settings import (
+    OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS, OUTBOX_MAX_BACKOFF,
+    OUTBOX_POLL_INTERVAL
+)
+from reviews.outbox import send_pending_emails
+
+logger = logging.getLogger('reviews.outbox')
+
+
+class Command(BaseCommand):
+    """
+    Команда для отправки писем из очереди.
+    Вызов python manage.py send_outbox_emails
+    из терминала в соответствующей папке.
+    """
+
+    help = 'Отправка писем из очереди с повторами при ошибках.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=OUTBOX_BATCH_SIZE,
+            help='Количество писем, забираемых из очереди за раз.'
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=OUTBOX_MAX_ATTEMPTS,
+            help='Количество попыток, после которых письмо считается '
+                 'не отправленным.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, проверяя очередь каждые '
+                 '--interval секунд.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=OUTBOX_POLL_INTERVAL,
+            help='Пауза между проверками очереди в режиме --loop.'
+        )
+
+    def handle(self, *args, **options):
+        failures = 0
+        while True:
+            close_old_connections()
+            try:
+                counts = send_pending_emails(
+                    batch_size=options['batch_size'],
+                    max_attempts=options['max_attempts'],
+                )
+            except Exception:
+                if not options['loop']:
+                    raise
+                failures += 1
+                delay = min(
+                    options['interval'] * 2 ** (failures - 1),
+                    OUTBOX_MAX_BACKOFF
+                )
+                logger.exception(
+                    'Не удалось отправить письма из очереди, '
+                    'повтор через %.0f с.', delay
+                )
+                time.sleep(delay)
+                continue
+            failures = 0
+            if any(counts.values()) or not options['loop']:
+                self.stdout.write(
+                    f'Отправлено: {counts["sent"]}, '
+                    f'отложено: {counts["retried"]}, '
+                    f'не отправлено: {counts["failed"]}.'
+                )
+            if not options['loop']:
+                return
+            if not any(counts.values()):
+                time.sleep(options['interval'])
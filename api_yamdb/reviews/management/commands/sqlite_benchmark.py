@@ -0,0 +1,171 @@
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from api_yamdb.settings import SQLITE_PRAGMAS
+from api_yamdb.sqlite.writes import run_serialized
+
+PROFILES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'OPTIONS': {},
+    },
+    'production': {
+        'ENGINE': 'api_yamdb.sqlite',
+        'OPTIONS': {
+            'pragmas': SQLITE_PRAGMAS,
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+}
+TITLES_COUNT = 100
+
+SCHEMA = (
+    'CREATE TABLE bench_title (id INTEGER PRIMARY KEY, '
+    'score_sum INTEGER NOT NULL, review_count INTEGER NOT NULL)',
+    'CREATE TABLE bench_review (id INTEGER PRIMARY KEY, '
+    'title_id INTEGER NOT NULL, score INTEGER NOT NULL)',
+    'CREATE INDEX bench_review_title ON bench_review (title_id, id)',
+)
+
+
+def read_title(alias):
+    """Страница отзывов произведения, как в GET /titles/<id>/reviews/."""
+    title_id = random.randint(1, TITLES_COUNT)
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            'SELECT score_sum, review_count FROM bench_title WHERE id = %s',
+            [title_id]
+        )
+        cursor.fetchone()
+        cursor.execute(
+            'SELECT id, score FROM bench_review WHERE title_id = %s '
+            'ORDER BY id DESC LIMIT 10', [title_id]
+        )
+        cursor.fetchall()
+
+
+def write_review(alias):
+    """Отзыв с пересчётом рейтинга, как в POST /titles/<id>/reviews/."""
+    title_id = random.randint(1, TITLES_COUNT)
+    score = random.randint(1, 10)
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            'SELECT review_count FROM bench_title WHERE id = %s', [title_id]
+        )
+        cursor.fetchone()
+        cursor.execute(
+            'INSERT INTO bench_review (title_id, score) VALUES (%s, %s)',
+            [title_id, score]
+        )
+        cursor.execute(
+            'UPDATE bench_title SET score_sum = score_sum + %s, '
+            'review_count = review_count + 1 WHERE id = %s',
+            [score, title_id]
+        )
+
+
+def run_writes(alias, profile):
+    if profile == 'production':
+        run_serialized(lambda: write_review(alias), using=alias)
+    else:
+        with transaction.atomic(using=alias):
+            write_review(alias)
+
+
+class Command(BaseCommand):
+    """
+    Команда для сравнения пропускной способности SQLite с настройками
+    по умолчанию и с профилем из settings.DATABASES.
+    Вызов python manage.py sqlite_benchmark
+    из терминала в соответствующей папке.
+    """
+
+    help = (
+        'Замер чтений и записей в секунду при одновременной работе '
+        'нескольких потоков с базой SQLite.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--readers', type=int, default=4,
+            help='Количество читающих потоков.'
+        )
+        parser.add_argument(
+            '--writers', type=int, default=4,
+            help='Количество пишущих потоков.'
+        )
+        parser.add_argument(
+            '--seconds', type=float, default=5,
+            help='Длительность замера для каждого профиля.'
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for profile in PROFILES:
+                alias = f'benchmark_{profile}'
+                connections.databases[alias] = dict(
+                    PROFILES[profile], NAME=Path(tmp_dir) / f'{alias}.sqlite3'
+                )
+                try:
+                    counts = self.run_profile(alias, profile, options)
+                finally:
+                    connections[alias].close()
+                    del connections.databases[alias]
+                seconds = options['seconds']
+                self.stdout.write(
+                    f'{profile}: чтений {counts["read"] / seconds:.0f}/с, '
+                    f'записей {counts["write"] / seconds:.0f}/с, '
+                    f'ошибок чтения {counts["read_error"]}, '
+                    f'ошибок записи {counts["write_error"]}.'
+                )
+
+    def run_profile(self, alias, profile, options):
+        with connections[alias].cursor() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+            cursor.executemany(
+                'INSERT INTO bench_title (score_sum, review_count) '
+                'VALUES (0, 0)', [()] * TITLES_COUNT
+            )
+        counts = Counter()
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['seconds']
+
+        def worker(kind, operation):
+            local = Counter()
+            try:
+                while time.monotonic() < deadline:
+                    try:
+                        operation()
+                        local[kind] += 1
+                    except OperationalError:
+                        local[f'{kind}_error'] += 1
+            finally:
+                connections[alias].close()
+                with lock:
+                    counts.update(local)
+
+        threads = [
+            threading.Thread(
+                target=worker, args=('read', lambda: read_title(alias))
+            )
+            for _ in range(options['readers'])
+        ] + [
+            threading.Thread(
+                target=worker,
+                args=('write', lambda: run_writes(alias, profile))
+            )
+            for _ in range(options['writers'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counts
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api_yamdb.replicas import sync_replicas
+from api_yamdb.settings import (
+    REPLICA_SYNC_INTERVAL, REPLICA_SYNC_MAX_DURATION
+)
+
+
+class Command(BaseCommand):
+    """
+    Команда для копирования основной базы в реплики для чтения.
+    Вызов python manage.py sync_replicas
+    из терминала в соответствующей папке.
+    """
+
+    help = 'Копирование основной базы в реплики из DATABASE_REPLICAS.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, копируя базу каждые '
+                 '--interval секунд.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=REPLICA_SYNC_INTERVAL,
+            help='Период копирования в режиме --loop.'
+        )
+
+    def handle(self, *args, **options):
+        if options['loop'] and options['interval'] > REPLICA_SYNC_INTERVAL:
+            self.stderr.write(
+                f'Интервал {options["interval"]} с больше '
+                f'REPLICA_SYNC_INTERVAL: клиенты могут не увидеть свои '
+                f'изменения после окна REPLICA_READ_YOUR_WRITES_WINDOW.'
+            )
+        while True:
+            started = time.monotonic()
+            sync_replicas()
+            elapsed = time.monotonic() - started
+            self.stdout.write(f'Реплики обновлены за {elapsed:.2f} с.')
+            if elapsed > REPLICA_SYNC_MAX_DURATION:
+                self.stderr.write(
+                    'Копирование дольше REPLICA_SYNC_MAX_DURATION: '
+                    'увеличьте его или REPLICA_READ_YOUR_WRITES_WINDOW.'
+                )
+            if not options['loop']:
+                return
+            time.sleep(max(options['interval'] - elapsed, 0))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    """
+    Команда для обновления статистики таблиц базы данных.
+    Вызов python manage.py update_db_statistics
+    из терминала в соответствующей папке.
+    """
+
+    help = (
+        'Обновление статистики планировщика (ANALYZE). По ней пагинация '
+        'оценивает количество записей больших таблиц.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Псевдоним базы данных.'
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(
+                'Статистика обновляется только для SQLite и PostgreSQL.'
+            )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            if connection.vendor == 'sqlite':
+                cursor.execute('PRAGMA optimize')
+        self.stdout.write('Статистика таблиц обновлена.')
@@ -0,0 +1,45 @@
+# Generated by Django 3.2 on 2026-10-18 17:12
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_title_rating(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    stats = Review.objects.using(schema_editor.connection.alias).order_by(
+    ).values('title').annotate(score_sum=Sum('score'), review_count=Count('pk'))
+    for row in stats:
+        Title.objects.using(schema_editor.connection.alias).filter(
+            pk=row['title']
+        ).update(
+            score_sum=row['score_sum'],
+            review_count=row['review_count'],
+            rating=row['score_sum'] // row['review_count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_auto_20240324_2145'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_title_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-18 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_review_comment_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='title',
+            options={'default_related_name': 'titles', 'ordering': ('-year', 'name', 'id'), 'verbose_name': 'Произведение', 'verbose_name_plural': 'Произведения'},
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-year', 'name', 'id'], name='title_catalogue_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+CREATE_SEARCH_INDEX = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS reviews_title_fts USING fts5(
+        name, description, tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    INSERT INTO reviews_title_fts(rowid, name, description)
+    SELECT id, name, description FROM reviews_title
+    """,
+)
+
+DROP_SEARCH_INDEX = (
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_title_catalogue_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements(CREATE_SEARCH_INDEX),
+            run_statements(DROP_SEARCH_INDEX),
+        ),
+    ]
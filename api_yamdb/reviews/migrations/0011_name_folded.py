@@ -0,0 +1,48 @@
+# Generated by Django 3.2 on 2026-10-18 17:24
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def fold_name(value):
+    """
+    Копия reviews.models.fold_name на момент миграции: миграция должна
+    давать те же данные, даже если функция в моделях изменится.
+    """
+    return unicodedata.normalize('NFKC', value).casefold().replace('ё', 'е')
+
+
+def fill_name_folded(apps, schema_editor):
+    for model_name in ('Category', 'Genre', 'Title'):
+        model = apps.get_model('reviews', model_name)
+        objects = model.objects.using(schema_editor.connection.alias)
+        for obj in objects.only('name').iterator():
+            obj.name_folded = fold_name(obj.name)
+            obj.save(update_fields=['name_folded'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='name_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Название для поиска'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='name_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Название для поиска'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='name_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Название для поиска'),
+        ),
+        migrations.RunPython(fill_name_folded, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_name_folded'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedRowHash',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filename', models.CharField(max_length=100, verbose_name='Файл')),
+                ('key', models.CharField(max_length=100, verbose_name='Ключ строки')),
+                ('digest', models.CharField(max_length=32, verbose_name='Хэш')),
+            ],
+            options={
+                'verbose_name': 'Хэш импортированной строки',
+                'verbose_name_plural': 'Хэши импортированных строк',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importedrowhash',
+            constraint=models.UniqueConstraint(fields=('filename', 'key'), name='unique_imported_row'),
+        ),
+    ]
@@ -1,6 +1,11 @@
+import unicodedata
+
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
 
 from reviews.validators import validate_year, validate_username
 
@@ -21,6 +26,14 @@ MIN_SCORE_VALUE = 1
 MAX_SCORE_VALUE = 10
 
 
+def fold_name(value):
+    """
+    Приводит название к виду для поиска без учёта регистра:
+    NFKC-нормализация, casefold и замена «ё» на «е».
+    """
+    return unicodedata.normalize('NFKC', value).casefold().replace('ё', 'е')
+
+
 class YamdbUser(AbstractUser):
     email = models.EmailField(
         verbose_name='Адрес электронной почты.', max_length=254, unique=True,
@@ -72,6 +85,13 @@ class CategoryGenreBase(models.Model):
         verbose_name='Идентификатор',
         unique=True,
     )
+    name_folded = models.CharField(
+        max_length=256,
+        verbose_name='Название для поиска',
+        default='',
+        db_index=True,
+        editable=False,
+    )
 
     class Meta:
         abstract = True
@@ -80,6 +100,10 @@ class CategoryGenreBase(models.Model):
     def __str__(self):
         return self.name[:30]
 
+    def save(self, *args, **kwargs):
+        self.name_folded = fold_name(self.name)
+        super().save(*args, **kwargs)
+
 
 class Category(CategoryGenreBase):
     """Модель категории."""
@@ -97,10 +121,53 @@ class Genre(CategoryGenreBase):
         verbose_name_plural = 'Жанры'
 
 
+class TitleQuerySet(models.QuerySet):
+    """Набор запросов произведений с поддержкой хранимого рейтинга."""
+
+    def shift_rating(self, score_delta, count_delta):
+        """
+        Изменяет сумму оценок и количество отзывов на заданные величины
+        и пересчитывает рейтинг одним UPDATE-запросом.
+        """
+        score_sum = F('score_sum') + score_delta
+        review_count = F('review_count') + count_delta
+        return self.update(
+            score_sum=score_sum,
+            review_count=review_count,
+            rating=score_sum / NullIf(review_count, 0),
+        )
+
+    def recalculate_rating(self):
+        """Пересчитывает рейтинг произведений заново по таблице отзывов."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        self.update(
+            score_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            review_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0
+            ),
+        )
+        return self.update(
+            rating=F('score_sum') / NullIf(F('review_count'), 0)
+        )
+
+
 class Title(models.Model):
     """Модель произведения."""
 
     name = models.CharField(max_length=256)
+    name_folded = models.CharField(
+        max_length=256,
+        verbose_name='Название для поиска',
+        default='',
+        db_index=True,
+        editable=False,
+    )
     year = models.PositiveSmallIntegerField(
         verbose_name='Год выпуска', validators=(validate_year,),
     )
@@ -115,16 +182,34 @@ class Title(models.Model):
     category = models.ForeignKey(
         Category, on_delete=models.SET_NULL, null=True
     )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок', default=0, editable=False
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов', default=0, editable=False
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг', null=True, blank=True, editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         default_related_name = 'titles'
-        ordering = ('-year', 'name')
+        ordering = ('-year', 'name', 'id')
+        indexes = [models.Index(
+            fields=['-year', 'name', 'id'], name='title_catalogue_idx'
+        )]
 
     def __str__(self):
         return self.name[:30]
 
+    def save(self, *args, **kwargs):
+        self.name_folded = fold_name(self.name)
+        super().save(*args, **kwargs)
+
 
 class TextAuthorDateFieldsBase(models.Model):
     """Базовая абстрактная модель комментариев, отзыв."""
@@ -136,7 +221,7 @@ class TextAuthorDateFieldsBase(models.Model):
 
     class Meta:
         abstract = True
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', 'id')
 
     def __str__(self) -> str:
         return self.text[:TEXT_SIZE]
@@ -152,6 +237,8 @@ class Review(TextAuthorDateFieldsBase):
                     MaxValueValidator(MAX_SCORE_VALUE)]
     )
 
+    _loaded_values = None
+
     class Meta(TextAuthorDateFieldsBase.Meta):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
@@ -159,6 +246,50 @@ class Review(TextAuthorDateFieldsBase):
         constraints = [models.UniqueConstraint(
             fields=['title', 'author'], name='unique_title_author'
         )]
+        indexes = [models.Index(
+            fields=['title', '-pub_date', 'id'], name='review_title_page_idx'
+        )]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные из базы произведение и оценку."""
+        instance = super().from_db(db, field_names, values)
+        if {'title_id', 'score'} <= set(field_names):
+            instance._loaded_values = {
+                'title_id': instance.title_id, 'score': instance.score
+            }
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохраняет отзыв и обновляет рейтинг произведения в транзакции."""
+        adding = self._state.adding
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            self._update_title_rating(adding)
+        self._loaded_values = {'title_id': self.title_id, 'score': self.score}
+
+    def _update_title_rating(self, adding):
+        previous = self._loaded_values
+        titles = Title.objects.using(self._state.db)
+        if adding:
+            # Внешние ключи в SQLite отложенные: внутри внешней транзакции
+            # они проверяются только при её фиксации. Отсутствие
+            # произведения видно сразу по числу обновлённых строк.
+            if not titles.filter(pk=self.title_id).shift_rating(
+                self.score, 1
+            ):
+                raise IntegrityError('FOREIGN KEY constraint failed')
+        elif previous is None:
+            titles.filter(pk=self.title_id).recalculate_rating()
+        elif previous['title_id'] != self.title_id:
+            titles.filter(pk=previous['title_id']).shift_rating(
+                -previous['score'], -1
+            )
+            titles.filter(pk=self.title_id).shift_rating(self.score, 1)
+        elif previous['score'] != self.score:
+            titles.filter(pk=self.title_id).shift_rating(
+                self.score - previous['score'], 0
+            )
 
 
 class Comment(TextAuthorDateFieldsBase):
@@ -170,3 +301,66 @@ class Comment(TextAuthorDateFieldsBase):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = [models.Index(
+            fields=['review', '-pub_date', 'id'],
+            name='comment_review_page_idx'
+        )]
+
+
+class ImportedRowHash(models.Model):
+    """
+    Хэш строки csv-файла, загруженной командой csv_importer --sync.
+    По нему синхронизация определяет, изменилась ли строка.
+    """
+    filename = models.CharField('Файл', max_length=MAX_LENGTH)
+    key = models.CharField('Ключ строки', max_length=MAX_LENGTH)
+    digest = models.CharField('Хэш', max_length=32)
+
+    class Meta:
+        verbose_name = 'Хэш импортированной строки'
+        verbose_name_plural = 'Хэши импортированных строк'
+        constraints = [models.UniqueConstraint(
+            fields=['filename', 'key'], name='unique_imported_row'
+        )]
+
+
+class OutboxEmail(models.Model):
+    """
+    Письмо в очереди на отправку. Записывается в той же транзакции,
+    что и изменение данных, а отправляется фоновым процессом
+    (команда send_outbox_emails).
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+
+    recipient = models.EmailField('Получатель', max_length=254)
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    status = models.CharField(
+        'Статус', max_length=max(len(status) for status, _ in STATUSES),
+        choices=STATUSES, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('id',)
+        indexes = [models.Index(
+            fields=['status', 'next_attempt_at'], name='outbox_pending_idx'
+        )]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,96 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from api_yamdb.settings import (
+    DEFAULT_FROM_EMAIL, OUTBOX_BATCH_SIZE, OUTBOX_LEASE_TIMEOUT,
+    OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_DELAY
+)
+from reviews.models import OutboxEmail
+
+UPDATE_FIELDS = ('status', 'attempts', 'next_attempt_at', 'last_error',
+                 'sent_at')
+
+
+def enqueue_email(recipient, subject, body):
+    """
+    Ставит письмо в очередь на отправку. Вызывается в транзакции
+    изменения данных, поэтому письмо уйдёт только после её коммита.
+    """
+    return OutboxEmail.objects.create(
+        recipient=recipient, subject=subject, body=body
+    )
+
+
+def get_retry_delay(attempts):
+    """Задержка перед повтором растёт вдвое с каждой неудачной попыткой."""
+    return timedelta(seconds=OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def claim_batch(batch_size, now):
+    """
+    Забирает пачку писем, которым подошло время отправки, и откладывает
+    их на OUTBOX_LEASE_TIMEOUT секунд, чтобы их не взял другой процесс.
+    Если процесс упадёт, письма вернутся в очередь после этого срока.
+    """
+    with transaction.atomic():
+        queryset = OutboxEmail.objects.filter(
+            status=OutboxEmail.PENDING, next_attempt_at__lte=now
+        ).order_by('next_attempt_at', 'id')
+        if db_connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        emails = list(queryset[:batch_size])
+        OutboxEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(next_attempt_at=now + timedelta(seconds=OUTBOX_LEASE_TIMEOUT))
+    return emails
+
+
+def send_email(connection, email, max_attempts, now):
+    """
+    Отправляет одно письмо и обновляет его состояние: отправлено,
+    отложено до следующей попытки или, после max_attempts попыток,
+    окончательно не отправлено. Возвращает новый статус.
+    """
+    email.attempts += 1
+    try:
+        sent = connection.send_messages([EmailMessage(
+            email.subject, email.body, DEFAULT_FROM_EMAIL, [email.recipient]
+        )])
+        if not sent:
+            raise RuntimeError('Почтовый сервер не принял письмо.')
+    except Exception as error:
+        email.last_error = f'{type(error).__name__}: {error}'
+        if email.attempts >= max_attempts:
+            email.status = OutboxEmail.FAILED
+            return 'failed'
+        email.next_attempt_at = now + get_retry_delay(email.attempts)
+        return 'retried'
+    email.status = OutboxEmail.SENT
+    email.sent_at = now
+    email.last_error = ''
+    return 'sent'
+
+
+def send_pending_emails(batch_size=OUTBOX_BATCH_SIZE,
+                        max_attempts=OUTBOX_MAX_ATTEMPTS, connection=None):
+    """
+    Отправляет все письма из очереди, которым подошло время, пачками
+    по batch_size через одно соединение с почтовым сервером.
+    Возвращает количество отправленных, отложенных и окончательно
+    не отправленных писем.
+    """
+    counts = Counter()
+    connection = connection or get_connection()
+    with connection:
+        while True:
+            now = timezone.now()
+            emails = claim_batch(batch_size, now)
+            if not emails:
+                return counts
+            for email in emails:
+                counts[send_email(connection, email, max_attempts, now)] += 1
+            OutboxEmail.objects.bulk_update(emails, UPDATE_FIELDS)
@@ -0,0 +1,115 @@
+import threading
+import time
+from typing import NamedTuple
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import router
+
+from api_yamdb.settings import (
+    REFERENCE_CACHE_CHECK_INTERVAL, REFERENCE_CACHE_TIMEOUT
+)
+from reviews.models import Category, Genre
+
+VERSION_KEY = 'reference-cache-version:{label}'
+
+
+class Snapshot(NamedTuple):
+    version: str
+    objects: tuple
+    by_slug: dict
+    by_id: dict
+    loaded_at: float
+    checked_at: float
+
+
+EMPTY_SNAPSHOT = Snapshot(None, (), {}, {}, float('-inf'), float('-inf'))
+
+
+class ReferenceCache:
+    """
+    Процессный кэш небольшого справочника (категорий или жанров).
+    Хранит объекты в порядке сортировки модели и индексы slug -> объект,
+    id -> объект. Актуальность проверяется по метке версии в общем
+    для процессов кэше Django не чаще раза в REFERENCE_CACHE_CHECK_INTERVAL
+    секунд: при изменении справочника метка меняется, и каждый процесс
+    перечитывает таблицу. Снимок в любом случае живёт не дольше
+    REFERENCE_CACHE_TIMEOUT секунд. Таблица читается из основной базы,
+    а не с реплики, иначе в кэш до следующего изменения попал бы снимок
+    без последней записи.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version_key = VERSION_KEY.format(label=model._meta.label_lower)
+        self._lock = threading.Lock()
+        self._snapshot = EMPTY_SNAPSHOT
+
+    def _get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid4().hex, None)
+            version = cache.get(self.version_key)
+        return version
+
+    def _get_snapshot(self):
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if (
+            now - snapshot.checked_at < REFERENCE_CACHE_CHECK_INTERVAL
+            and now - snapshot.loaded_at < REFERENCE_CACHE_TIMEOUT
+        ):
+            return snapshot
+        version = self._get_version()
+        with self._lock:
+            snapshot = self._snapshot
+            if (
+                snapshot.version != version
+                or now - snapshot.loaded_at >= REFERENCE_CACHE_TIMEOUT
+            ):
+                objects = tuple(self.model.objects.using(
+                    router.db_for_write(self.model)
+                ))
+                snapshot = Snapshot(
+                    version,
+                    objects,
+                    {obj.slug: obj for obj in objects},
+                    {obj.pk: obj for obj in objects},
+                    loaded_at=now,
+                    checked_at=now,
+                )
+            else:
+                snapshot = snapshot._replace(checked_at=now)
+            self._snapshot = snapshot
+            return snapshot
+
+    def all(self):
+        """Возвращает все объекты справочника."""
+        return self._get_snapshot().objects
+
+    def get_by_slug(self, slug):
+        return self._get_snapshot().by_slug.get(slug)
+
+    def get_by_id(self, pk):
+        return self._get_snapshot().by_id.get(pk)
+
+    def invalidate(self):
+        """
+        Меняет метку версии, чтобы все процессы перечитали справочник,
+        и сразу сбрасывает снимок текущего процесса. Вызывается после
+        фиксации транзакции: иначе другой поток успел бы прочитать старые
+        строки уже под новой меткой.
+        """
+        with self._lock:
+            cache.set(self.version_key, uuid4().hex, None)
+            self._snapshot = EMPTY_SNAPSHOT
+
+
+reference_caches = {
+    Category: ReferenceCache(Category),
+    Genre: ReferenceCache(Genre),
+}
+
+
+def get_reference_cache(model):
+    return reference_caches[model]
@@ -0,0 +1,94 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from reviews.models import Title
+
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+SEARCH_WORD = re.compile(r'\w+')
+
+
+def is_search_index_supported(using='default'):
+    """Полнотекстовый индекс произведений поддерживается только в SQLite."""
+    return connections[using].vendor == 'sqlite'
+
+
+def build_match_query(term):
+    """
+    Превращает строку поиска в выражение FTS5 MATCH:
+    каждое слово ищется по префиксу, все слова обязательны.
+    """
+    return ' '.join(f'"{word}"*' for word in SEARCH_WORD.findall(term))
+
+
+def index_title(title, using='default'):
+    """Добавляет произведение в индекс или обновляет его запись."""
+    index_titles([title], using)
+
+
+def index_titles(titles, using='default'):
+    """Добавляет произведения в индекс или обновляет их записи."""
+    if not titles or not is_search_index_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {TITLE_SEARCH_TABLE} WHERE rowid = %s',
+            [[title.pk] for title in titles]
+        )
+        cursor.executemany(
+            f'INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [[title.pk, title.name, title.description] for title in titles]
+        )
+
+
+def unindex_title(title_id, using='default'):
+    """Удаляет произведение из индекса."""
+    if not is_search_index_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {TITLE_SEARCH_TABLE} WHERE rowid = %s', [title_id]
+        )
+
+
+def rebuild_search_index(using='default'):
+    """Перестраивает индекс заново по таблице произведений."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TITLE_SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description) '
+            f'SELECT id, name, description FROM {Title._meta.db_table}'
+        )
+        cursor.execute(
+            f"INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}) "
+            "VALUES('optimize')"
+        )
+
+
+def search_titles(queryset, term):
+    """
+    Оставляет в выборке произведения, подходящие под строку поиска,
+    и сортирует их по релевантности (bm25) по названию и описанию.
+    Без поддержки индекса ищет вхождение каждого слова без ранжирования.
+    """
+    match = build_match_query(term)
+    if not match:
+        return queryset
+    if not is_search_index_supported(queryset.db):
+        for word in SEARCH_WORD.findall(term):
+            queryset = queryset.filter(
+                Q(name__icontains=word) | Q(description__icontains=word)
+            )
+        return queryset
+    table = queryset.model._meta.db_table
+    return queryset.extra(
+        tables=[TITLE_SEARCH_TABLE],
+        where=[
+            f'{TITLE_SEARCH_TABLE}.rowid = {table}.id',
+            f'{TITLE_SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match],
+        select={'search_rank': f'{TITLE_SEARCH_TABLE}.rank'},
+    ).order_by('search_rank', 'id')
@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Review, Title
+from reviews.reference_cache import get_reference_cache
+from reviews.search import index_title, unindex_title
+
+
+@receiver(post_delete, sender=Review)
+def decrease_title_rating(sender, instance, using, **kwargs):
+    """
+    Уменьшает рейтинг произведения при удалении отзыва.
+    Срабатывает и при каскадном удалении автора, внутри той же транзакции.
+    """
+    Title.objects.using(using).filter(pk=instance.title_id).shift_rating(
+        -instance.score, -1
+    )
+
+
+@receiver(post_save, sender=Title)
+def update_title_search_index(sender, instance, using, update_fields,
+                              **kwargs):
+    """Обновляет полнотекстовый индекс после сохранения произведения."""
+    if update_fields and not {'name', 'description'} & set(update_fields):
+        return
+    index_title(instance, using)
+
+
+@receiver(post_delete, sender=Title)
+def remove_title_from_search_index(sender, instance, using, **kwargs):
+    """Удаляет произведение из полнотекстового индекса."""
+    unindex_title(instance.pk, using)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_reference_cache(sender, using, **kwargs):
+    """
+    Сбрасывает процессный кэш категорий и жанров во всех процессах
+    после фиксации транзакции.
+    """
+    transaction.on_commit(get_reference_cache(sender).invalidate, using=using)
@@ -4,6 +4,8 @@ import pytest
 from django.core import mail
 from django.db.utils import IntegrityError
 
+from reviews.outbox import send_pending_emails
+
 from tests.utils import (invalid_data_for_user_patch_and_creation,
                          invalid_data_for_username_and_email_fields)
 
@@ -110,6 +112,7 @@ class Test00UserRegistration:
         }
 
         response = client.post(self.URL_SIGNUP, data=valid_data)
+        send_pending_emails()
         outbox_after = mail.outbox  # email outbox after user create
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
@@ -159,6 +162,7 @@ class Test00UserRegistration:
         response = admin_client.post(
             self.URL_ADMIN_CREATE_USER, data=valid_data
         )
+        send_pending_emails()
         outbox_after = mail.outbox
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
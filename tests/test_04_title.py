@@ -83,7 +83,7 @@ class Test04TitleAPI:
             'числом.'
         )
 
-        response = client.get(self.TITLES_URL)
+        response = client.get(self.TITLES_URL, {'page': 1})
         assert response.status_code == HTTPStatus.OK, (
             'Проверьте, что GET-запрос неавторизованного пользователя к '
             f'`{self.TITLES_URL}` возвращает ответ со статусом 200.'
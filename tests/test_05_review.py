@@ -183,7 +183,7 @@ class Test05ReviewAPI:
             'должен вернуться ответ со статусом 400.'
         )
 
-        response = user_client.get(first_title_reviews_url)
+        response = user_client.get(first_title_reviews_url, {'page': 1})
         assert response.status_code == HTTPStatus.OK, (
             'Проверьте, что GET-запрос авторизованного пользователя к '
             f'`{self.REVIEWS_URL_TEMPLATE}` возвращает ответ со статусом 200.'
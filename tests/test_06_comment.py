@@ -99,7 +99,8 @@ class Test06CommentAPI:
             self.COMMENTS_URL_TEMPLATE.format(
                 title_id=titles[0]['id'],
                 review_id=reviews[0]['id']
-            )
+            ),
+            {'page': 1}
         )
         assert response.status_code == HTTPStatus.OK, (
             'Проверьте, что GET-запрос авторизованного пользователя к '
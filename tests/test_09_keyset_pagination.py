@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from reviews.models import Category, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09KeysetPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_reviews(self, django_user_model, count):
+        title = Title.objects.create(name='Сталкер', year=1979)
+        for idx in range(count):
+            author = django_user_model.objects.create_user(
+                username=f'reader{idx}', email=f'reader{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'отзыв {idx}', score=7
+            )
+        same_moment = timezone.now()
+        Review.objects.filter(pk__in=Review.objects.filter(
+            title=title
+        ).order_by('id').values('id')[:4]).update(pub_date=same_moment)
+        return title
+
+    def test_01_cursor_walks_all_reviews(self, client, django_user_model):
+        title = self.create_reviews(django_user_model, 12)
+        expected = list(
+            Review.objects.filter(title=title).values_list('id', flat=True)
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+
+        seen = []
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорная пагинация отзывов не выполняет '
+                'подсчёт всех записей.'
+            )
+            pages.append(data)
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+
+        assert seen == expected, (
+            'Проверьте, что курсорная пагинация отзывов возвращает все '
+            'отзывы ровно один раз и в порядке (-pub_date, id).'
+        )
+        response = client.get(pages[-1]['previous'])
+        assert response.json()['results'] == pages[-2]['results'], (
+            'Проверьте, что ссылка `previous` курсорной пагинации ведёт на '
+            'предыдущую страницу.'
+        )
+
+    def test_02_page_number_format_kept(self, client, django_user_model):
+        title = self.create_reviews(django_user_model, 7)
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id), {'page': 2}
+        )
+        data = response.json()
+        assert data['count'] == 7 and len(data['results']) == 2, (
+            'Проверьте, что при передаче параметра `page` отзывы '
+            'возвращаются в постраничном формате.'
+        )
+
+    def test_03_invalid_cursor(self, client, django_user_model):
+        title = self.create_reviews(django_user_model, 1)
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            {'cursor': 'broken'}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_titles_cursor_with_filter(self, client):
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книга', slug='books')
+        for idx in range(9):
+            Title.objects.create(
+                name=f'Произведение {idx % 3}', year=2000 + idx % 2,
+                category=films if idx % 3 else books
+            )
+        expected = list(Title.objects.filter(
+            category=films
+        ).values_list('id', flat=True))
+
+        seen = []
+        response = client.get(self.TITLES_URL, {'category': 'films'})
+        while True:
+            data = response.json()
+            seen.extend(title['id'] for title in data['results'])
+            if not data['next']:
+                break
+            Title.objects.create(name='Новинка', year=2020, category=films)
+            response = client.get(data['next'])
+
+        assert seen == expected, (
+            'Проверьте, что курсорная пагинация произведений учитывает '
+            'фильтры, сохраняет порядок (-year, name, id) и не дублирует '
+            'записи при добавлении новых произведений.'
+        )
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.pagination import CachedCountPaginator, get_count_version
+from reviews.models import OutboxEmail
+
+
+def count_queries(captured):
+    return sum(
+        'COUNT(' in query['sql'].upper() for query in captured.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CountCache:
+
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_count_is_cached_and_invalidated(self, admin_client, user):
+        admin_client.get(self.USERS_URL, {'search': 'Test'})
+
+        with CaptureQueriesContext(connection) as captured:
+            response = admin_client.get(self.USERS_URL, {'search': 'Test'})
+        assert response.status_code == HTTPStatus.OK
+        assert count_queries(captured) == 0, (
+            'Проверьте, что повторный запрос списка с теми же фильтрами '
+            'берёт количество записей из кэша.'
+        )
+
+        admin_client.post(
+            self.USERS_URL,
+            data={'username': 'TestReader', 'email': 'reader@yamdb.fake'}
+        )
+        with CaptureQueriesContext(connection) as captured:
+            response = admin_client.get(self.USERS_URL, {'search': 'Test'})
+        assert count_queries(captured) == 1
+        assert response.json()['count'] == 3, (
+            'Проверьте, что запись в модель сбрасывает кэш количества '
+            'записей.'
+        )
+
+    def test_02_estimated_count_above_threshold(self, admin_client, user,
+                                                django_user_model,
+                                                monkeypatch):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            cursor.execute(
+                'UPDATE sqlite_stat1 SET stat = %s WHERE tbl = %s',
+                ['250000 1', django_user_model._meta.db_table]
+            )
+        monkeypatch.setattr(CachedCountPaginator, 'estimate_threshold', 1000)
+
+        response = admin_client.get(self.USERS_URL)
+        assert response.json()['count'] == 250000, (
+            'Проверьте, что для больших таблиц без фильтров используется '
+            'оценка количества записей из статистики базы данных.'
+        )
+
+        response = admin_client.get(self.USERS_URL, {'search': user.username})
+        assert response.json()['count'] == 1
+
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM sqlite_stat1')
+
+    def test_03_invalidation_scope_and_commit(self, admin_client, user,
+                                              django_user_model):
+        version = get_count_version(OutboxEmail)
+        OutboxEmail.objects.create(
+            recipient='a@yamdb.fake', subject='Тема', body='Текст'
+        )
+        assert get_count_version(OutboxEmail) == version, (
+            'Проверьте, что кэш количества сбрасывается только для '
+            'пагинируемых моделей.'
+        )
+
+        version = get_count_version(django_user_model)
+        with transaction.atomic():
+            django_user_model.objects.create(
+                username='TestWriter', email='writer@yamdb.fake'
+            )
+            assert get_count_version(django_user_model) == version, (
+                'Проверьте, что кэш количества сбрасывается после '
+                'фиксации транзакции.'
+            )
+        assert get_count_version(django_user_model) > version
+
+        call_command('update_db_statistics', stdout=StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = %s',
+                [django_user_model._meta.db_table]
+            )
+            assert cursor.fetchone()[0] > 0, (
+                'Проверьте, что команда update_db_statistics собирает '
+                'статистику таблиц.'
+            )
+            cursor.execute('DELETE FROM sqlite_stat1')
@@ -0,0 +1,46 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def create_titles(self, count):
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(3)
+        ]
+        titles = []
+        for idx in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000,
+                category=Category.objects.create(
+                    name=f'Категория {idx}', slug=f'category-{idx}'
+                )
+            )
+            title.genre.set(genres)
+            titles.append(title)
+        return titles
+
+    @pytest.mark.parametrize('titles_count', (1, 5, 8))
+    def test_01_list_query_count(self, client, django_assert_num_queries,
+                                 titles_count):
+        self.create_titles(titles_count)
+        with django_assert_num_queries(2):
+            response = client.get(self.TITLES_URL)
+        assert response.json()['results'][0]['genre'], (
+            'Проверьте, что ответ на GET-запрос к `/api/v1/titles/` '
+            'содержит жанры произведения.'
+        )
+
+    def test_02_retrieve_query_count(self, client, django_assert_num_queries):
+        title, = self.create_titles(1)
+        with django_assert_num_queries(2):
+            response = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+            )
+        assert response.json()['category']['slug'] == title.category.slug
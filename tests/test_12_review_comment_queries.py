@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ReviewCommentQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def create_review_thread(self, django_user_model, count):
+        title = Title.objects.create(name='Солярис', year=1972)
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'reader{idx}', email=f'reader{idx}@yamdb.fake'
+            )
+            for idx in range(count)
+        ]
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='отзыв', score=8
+            )
+            for author in authors
+        ]
+        for author in authors:
+            Comment.objects.create(
+                review=reviews[0], author=author, text='комментарий'
+            )
+        return title, reviews[0]
+
+    @pytest.mark.parametrize('authors_count', (1, 5))
+    def test_01_list_query_count(self, client, django_user_model,
+                                 django_assert_num_queries, authors_count):
+        title, review = self.create_review_thread(
+            django_user_model, authors_count
+        )
+        with django_assert_num_queries(2):
+            response = client.get(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+            )
+        assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(2):
+            response = client.get(self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            ))
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'][0]['author'].startswith('reader')
+
+    def test_02_review_create_single_insert(self, user_client):
+        title = Title.objects.create(name='Зеркало', year=1975)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        data = {'text': 'Смотрел дважды', 'score': 9}
+
+        with CaptureQueriesContext(connection) as captured:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        lookups = [
+            query['sql'] for query in captured.captured_queries
+            if query['sql'].startswith('SELECT')
+            and ('"reviews_title"' in query['sql']
+                 or '"reviews_review"' in query['sql'])
+        ]
+        assert not lookups, (
+            'Проверьте, что создание отзыва не загружает произведение и не '
+            'проверяет наличие отзыва отдельными запросами.'
+        )
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставляли отзыв.']
+        }
+        assert Title.objects.get(pk=title.id).review_count == 1
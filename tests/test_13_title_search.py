@@ -0,0 +1,66 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, term):
+        response = client.get(self.TITLES_URL, {'search': term})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_ranked_and_case_folded(self, client):
+        Title.objects.create(
+            name='Побег из Шоушенка', year=1994,
+            description='Тюремная драма о надежде.'
+        )
+        Title.objects.create(
+            name='Зелёная миля', year=1999,
+            description='Тюремный надзиратель и чудо.'
+        )
+        Title.objects.create(
+            name='Тюремный блюз', year=2001,
+            description='Тюремные песни и тюремная жизнь.'
+        )
+        Title.objects.create(name='Сталкер', year=1979)
+
+        assert self.search(client, 'шоушенк') == ['Побег из Шоушенка'], (
+            'Проверьте, что поиск произведений не зависит от регистра '
+            'и находит слова по началу.'
+        )
+        assert self.search(client, 'тюремн')[0] == 'Тюремный блюз', (
+            'Проверьте, что результаты поиска отсортированы по релевантности.'
+        )
+        assert self.search(client, 'тюремная надежде') == [
+            'Побег из Шоушенка'
+        ]
+        assert self.search(client, 'солярис') == []
+
+    def test_02_index_follows_changes(self, client):
+        title = Title.objects.create(name='Солярис', year=1972)
+        title.name = 'Солярис Тарковского'
+        title.save()
+        assert self.search(client, 'тарковского') == ['Солярис Тарковского']
+
+        title.delete()
+        assert self.search(client, 'солярис') == []
+
+        Title.objects.create(name='Зеркало', year=1975)
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM reviews_title_fts')
+        assert self.search(client, 'зеркало') == []
+        call_command('rebuild_search_index')
+        cache.clear()
+        assert self.search(client, 'зеркало') == ['Зеркало'], (
+            'Проверьте, что команда `rebuild_search_index` заново заполняет '
+            'полнотекстовый индекс.'
+        )
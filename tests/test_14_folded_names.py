@@ -0,0 +1,51 @@
+import pytest
+from django.db import connection
+
+from api.filters import filter_folded_prefix
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14FoldedNames:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def test_01_unicode_case_insensitive_lookups(self, client):
+        Genre.objects.create(name='Ёлочная сказка', slug='fairy-tale')
+        Genre.objects.create(name='Драма', slug='drama')
+        category = Category.objects.create(name='Фильм', slug='movie')
+        Title.objects.create(name='ЗЕРКАЛО', year=1975, category=category)
+        Title.objects.create(name='Зеркало для героя', year=1987)
+        Title.objects.create(name='Сталкер', year=1979, category=category)
+
+        response = client.get(self.GENRES_URL, {'search': 'ЕЛОЧ'})
+        assert [
+            genre['slug'] for genre in response.json()['results']
+        ] == ['fairy-tale'], (
+            'Проверьте, что поиск жанров по названию не зависит от регистра '
+            'и буквы «ё».'
+        )
+
+        response = client.get(self.TITLES_URL, {'name': 'зеркало'})
+        assert {
+            title['name'] for title in response.json()['results']
+        } == {'ЗЕРКАЛО', 'Зеркало для героя'}, (
+            'Проверьте, что фильтр произведений по названию ищет по началу '
+            'названия без учёта регистра.'
+        )
+
+        response = client.get(self.TITLES_URL, {'category': 'movie'})
+        assert len(response.json()['results']) == 2
+
+    def test_02_prefix_filter_uses_index(self):
+        sql, params = filter_folded_prefix(
+            Title.objects.all(), 'name_folded', 'зер'
+        ).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'USING INDEX' in plan and 'name_folded' in plan, (
+            'Проверьте, что префиксный поиск по названию выполняется '
+            f'по индексу. План запроса: {plan}'
+        )
@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from reviews import reference_cache
+from reviews.models import Category, Genre
+from reviews.reference_cache import get_reference_cache
+
+
+def reference_queries(captured):
+    return [
+        query['sql'] for query in captured.captured_queries
+        if query['sql'].startswith('SELECT') and (
+            '"reviews_category"' in query['sql']
+            or '"reviews_genre"' in query['sql']
+        )
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ReferenceCache:
+
+    CATEGORY_URL = '/api/v1/categories/'
+    GENRES_URL = '/api/v1/genres/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_lists_served_from_cache(self, client, admin_client):
+        Category.objects.create(name='Фильм', slug='movie')
+        client.get(self.CATEGORY_URL)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(self.CATEGORY_URL, {'search': 'фил'})
+        assert response.json()['results'] == [
+            {'name': 'Фильм', 'slug': 'movie'}
+        ]
+        assert not captured.captured_queries, (
+            'Проверьте, что список категорий отдаётся из кэша без '
+            'запросов к базе данных.'
+        )
+
+        response = admin_client.post(
+            self.CATEGORY_URL, data={'name': 'Книга', 'slug': 'book'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get(self.CATEGORY_URL)
+        assert response.json()['count'] == 2, (
+            'Проверьте, что добавление категории сбрасывает кэш справочника.'
+        )
+
+    def test_02_title_write_resolves_slugs_from_cache(self, admin_client):
+        Category.objects.create(name='Фильм', slug='movie')
+        for slug in ('drama', 'comedy', 'horror'):
+            Genre.objects.create(name=slug, slug=slug)
+        data = {
+            'name': 'Сталкер',
+            'year': 1979,
+            'genre': ['drama', 'comedy', 'horror'],
+            'category': 'movie',
+        }
+        admin_client.post(self.TITLES_URL, data=data)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert not any(
+            'WHERE "reviews_genre"."slug"' in sql
+            or 'WHERE "reviews_category"."slug"' in sql
+            for sql in reference_queries(captured)
+        ), (
+            'Проверьте, что slug категорий и жанров при записи произведения '
+            'находятся в кэше справочника.'
+        )
+
+        response = admin_client.post(
+            self.TITLES_URL, data={**data, 'genre': ['western']}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_invalidation_on_commit_and_timeout(self, monkeypatch):
+        categories = get_reference_cache(Category)
+        Category.objects.create(name='Фильм', slug='movie')
+        assert len(categories.all()) == 1
+        version = cache.get(categories.version_key)
+
+        with transaction.atomic():
+            Category.objects.create(name='Книга', slug='book')
+            assert cache.get(categories.version_key) == version, (
+                'Проверьте, что кэш справочника сбрасывается только после '
+                'фиксации транзакции.'
+            )
+        assert cache.get(categories.version_key) != version
+        assert len(categories.all()) == 2
+
+        Category.objects.filter(slug='book').update(name='Журнал')
+        assert categories.get_by_slug('book').name == 'Книга'
+        monkeypatch.setattr(reference_cache, 'REFERENCE_CACHE_TIMEOUT', 0)
+        assert categories.get_by_slug('book').name == 'Журнал', (
+            'Проверьте, что снимок справочника перечитывается по истечении '
+            'REFERENCE_CACHE_TIMEOUT, даже если метка версии не менялась.'
+        )
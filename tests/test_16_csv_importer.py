@@ -0,0 +1,215 @@
+import csv
+import json
+
+import pytest
+from django.core.management import call_command
+
+from reviews import importer
+from reviews.importer import CsvImporter, get_work_dir
+from reviews.models import Comment, Review, Title
+
+CSV_FILES = {
+    'category.csv': 'id,name,slug\n1,Фильм,movie\n',
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n2,Комедия,comedy\n',
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Сталкер,1979,1\n'
+        '2,Из будущего,3000,1\n'
+        '3,Без категории,1980,7\n'
+    ),
+    'genre_title.csv': (
+        'id,title_id,genre_id\n'
+        '1,1,1\n'
+        '2,1,2\n'
+        '3,1,1\n'
+        '4,1,9\n'
+    ),
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '100,reader,reader@yamdb.fake,user,,,\n'
+        '101,critic,critic@yamdb.fake,moderator,,,\n'
+        '102,me,me@yamdb.fake,user,,,\n'
+    ),
+    'review.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,Шедевр,100,10,2019-09-24T21:08:21.567Z\n'
+        '2,1,Скучно,101,5,2019-09-25T21:08:21.567Z\n'
+        '3,1,Оценка вне шкалы,101,11,2019-09-25T21:08:21.567Z\n'
+        '4,2,Нет произведения,100,7,2019-09-25T21:08:21.567Z\n'
+    ),
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,1,Согласен,101,2020-01-13T23:20:02.422Z\n'
+    ),
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, 'CSV_IMPORT_WORK_DIR', tmp_path / 'work')
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    for filename, content in CSV_FILES.items():
+        (data_dir / filename).write_text(content, encoding='utf-8')
+    return data_dir
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16CsvImporter:
+
+    def test_01_bulk_import(self, data_dir, capsys):
+        call_command(
+            'csv_importer', data_dir=str(data_dir), batch_size=2, workers=2
+        )
+        output = capsys.readouterr()
+
+        assert list(Title.objects.values_list('id', flat=True)) == [1], (
+            'Проверьте, что импорт отклоняет произведения с некорректным '
+            'годом и несуществующей категорией.'
+        )
+        assert set(
+            Title.objects.get(pk=1).genre.values_list('slug', flat=True)
+        ) == {'drama', 'comedy'}, (
+            'Проверьте, что импорт загружает связи произведений и жанров '
+            'из genre_title.csv без дублей.'
+        )
+        assert set(Review.objects.values_list('id', flat=True)) == {1, 2}
+        assert Comment.objects.count() == 1
+        assert 'строка 4 (id=3)' in output.err
+        assert 'строк/с' in output.out
+
+        title = Title.objects.get(pk=1)
+        assert (title.review_count, title.rating) == (2, 7), (
+            'Проверьте, что после импорта отзывов пересчитывается рейтинг.'
+        )
+        assert title.name_folded == 'сталкер'
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Проверьте, что импорт сохраняет дату публикации из файла.'
+        )
+
+        call_command('csv_importer', data_dir=str(data_dir))
+        assert Title.genre.through.objects.count() == 2
+        assert Review.objects.count() == 2, (
+            'Проверьте, что повторный импорт не дублирует записи.'
+        )
+
+    def test_02_resume_after_failure(self, data_dir, monkeypatch):
+        review_lines = ['id,title_id,text,author,score,pub_date']
+        for idx in range(1, 8):
+            review_lines.append(
+                f'{idx},1,"Отзыв\nв две строки",{99 + idx},5,'
+                '2019-09-24T21:08:21.567Z'
+            )
+        review_lines.insert(5, '8,1,Лишний столбец,100,5,2019,?')
+        (data_dir / 'review.csv').write_text(
+            '\n'.join(review_lines) + '\n', encoding='utf-8'
+        )
+        (data_dir / 'users.csv').write_text(
+            'id,username,email,role,bio,first_name,last_name\n' + ''.join(
+                f'{100 + idx},user{idx},user{idx}@yamdb.fake,user,,,\n'
+                for idx in range(7)
+            ), encoding='utf-8'
+        )
+        work_dir = get_work_dir(data_dir)
+        checkpoint_path = work_dir / 'csv_importer.checkpoint.json'
+        original_write_batch = CsvImporter.write_batch
+        calls = []
+
+        def failing_write_batch(importer, model, batch):
+            if model is Review:
+                calls.append(len(batch))
+                if len(calls) == 2:
+                    raise RuntimeError('Сбой при вставке.')
+            original_write_batch(importer, model, batch)
+
+        monkeypatch.setattr(CsvImporter, 'write_batch', failing_write_batch)
+        with pytest.raises(RuntimeError):
+            call_command(
+                'csv_importer', data_dir=str(data_dir), batch_size=3,
+                workers=1
+            )
+        assert Review.objects.count() == 3, (
+            'Проверьте, что импорт коммитит каждую пачку отдельно.'
+        )
+        state = json.loads(checkpoint_path.read_text(encoding='utf-8'))
+        assert (state['filename'], state['line']) == ('review.csv', 4), (
+            'Проверьте, что после каждой пачки сохраняется контрольная '
+            'точка с именем файла и номером строки.'
+        )
+
+        monkeypatch.setattr(CsvImporter, 'write_batch', original_write_batch)
+        call_command(
+            'csv_importer', data_dir=str(data_dir), batch_size=3,
+            workers=2, resume=True
+        )
+        assert list(
+            Review.objects.order_by('id').values_list('id', flat=True)
+        ) == list(range(1, 8)), (
+            'Проверьте, что импорт с `--resume` продолжается с контрольной '
+            'точки и не теряет строки, занимающие несколько строк файла.'
+        )
+        assert Review.objects.get(pk=7).text == 'Отзыв\nв две строки'
+        assert Title.objects.get(pk=1).review_count == 7
+        assert not checkpoint_path.exists(), (
+            'Проверьте, что после успешного импорта контрольная точка '
+            'удаляется.'
+        )
+
+        assert sorted(path.name for path in data_dir.iterdir()) == sorted(
+            CSV_FILES
+        ), (
+            'Проверьте, что импорт не создаёт файлов в папке с данными.'
+        )
+        with open(work_dir / 'rejects' / 'review.rejects.csv',
+                  encoding='utf-8', newline='') as file:
+            rejected = list(csv.DictReader(file))
+        assert [row['id'] for row in rejected] == ['8'], (
+            'Проверьте, что отклонённые строки записываются в отдельный '
+            'файл ровно один раз.'
+        )
+        assert rejected[0]['error']
+
+    def test_03_sync_changed_rows(self, data_dir, capsys):
+        call_command('csv_importer', data_dir=str(data_dir), sync=True)
+        assert Review.objects.count() == 2
+
+        (data_dir / 'titles.csv').write_text(
+            'id,name,year,category\n1,Солярис,1972,1\n', encoding='utf-8'
+        )
+        (data_dir / 'genre_title.csv').write_text(
+            'id,title_id,genre_id\n1,1,1\n', encoding='utf-8'
+        )
+        with open(data_dir / 'users.csv', 'a', encoding='utf-8') as file:
+            file.write('103,viewer,viewer@yamdb.fake,user,,,\n')
+        (data_dir / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            '2,1,Скучно,101,9,2019-09-25T21:08:21.567Z\n'
+            '5,1,Новый,103,7,2019-09-26T21:08:21.567Z\n',
+            encoding='utf-8'
+        )
+        capsys.readouterr()
+        call_command('csv_importer', data_dir=str(data_dir), sync=True)
+        output = capsys.readouterr().out
+
+        assert (
+            'review.csv: строк 2, добавлено 1, изменено 1, удалено 1, '
+            'без изменений 0'
+        ) in output
+        assert (
+            'users.csv: строк 4, добавлено 1, изменено 0, удалено 0, '
+            'без изменений 2'
+        ) in output, (
+            'Проверьте, что синхронизация пропускает неизменённые строки.'
+        )
+        title = Title.objects.get(pk=1)
+        assert (title.name_folded, title.year) == ('солярис', 1972)
+        assert list(title.genre.values_list('slug', flat=True)) == ['drama']
+        assert set(Review.objects.values_list('id', flat=True)) == {2, 5}
+        assert (title.review_count, title.rating) == (2, 8), (
+            'Проверьте, что синхронизация пересчитывает рейтинг '
+            'затронутых произведений.'
+        )
+        assert not Comment.objects.exists(), (
+            'Проверьте, что удаление отзыва при синхронизации удаляет '
+            'его комментарии.'
+        )
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from reviews import importer
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+def snapshot():
+    return {
+        'titles': list(Title.objects.order_by('id').values_list(
+            'id', 'name', 'year', 'category__slug', 'description', 'rating'
+        )),
+        'genres': sorted(Title.genre.through.objects.values_list(
+            'title_id', 'genre__slug'
+        )),
+        'reviews': list(Review.objects.order_by('id').values_list(
+            'id', 'title_id', 'author__username', 'text', 'score', 'pub_date'
+        )),
+        'comments': list(Comment.objects.order_by('id').values_list(
+            'id', 'review_id', 'author__username', 'text', 'pub_date'
+        )),
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17CsvExporter:
+
+    def create_data(self, django_user_model):
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        title = Title.objects.create(
+            name='Сталкер', year=1979, category=movie,
+            description='Фильм, "зона"\nи комната'
+        )
+        title.genre.set([drama, comedy])
+        Title.objects.create(name='Без категории', year=1980)
+        for idx, score in enumerate((10, 5)):
+            author = django_user_model.objects.create_user(
+                username=f'reader{idx}', email=f'reader{idx}@yamdb.fake'
+            )
+            review = Review.objects.create(
+                title=title, author=author, text=f'Отзыв {idx}', score=score
+            )
+        Comment.objects.create(review=review, author=author, text='Верно')
+
+    def test_01_csv_round_trip(self, django_user_model, tmp_path,
+                               monkeypatch):
+        monkeypatch.setattr(
+            importer, 'CSV_IMPORT_WORK_DIR', tmp_path / 'work'
+        )
+        self.create_data(django_user_model)
+        expected = snapshot()
+
+        call_command('csv_exporter', output_dir=str(tmp_path))
+        header = (tmp_path / 'titles.csv').read_text(
+            encoding='utf-8'
+        ).splitlines()[0]
+        assert header == 'id,name,year,category,description,rating'
+
+        for model in (Comment, Review, Title, Genre, Category):
+            model.objects.all().delete()
+        django_user_model.objects.all().delete()
+        call_command('csv_importer', data_dir=str(tmp_path), workers=1)
+
+        assert snapshot() == expected, (
+            'Проверьте, что выгрузка csv_exporter загружается обратно '
+            'командой csv_importer без потерь.'
+        )
+
+    def test_02_ndjson(self, django_user_model, tmp_path):
+        self.create_data(django_user_model)
+
+        call_command(
+            'csv_exporter', output_dir=str(tmp_path), export_format='ndjson'
+        )
+        with open(tmp_path / 'titles.ndjson', encoding='utf-8') as file:
+            titles = [json.loads(line) for line in file]
+        assert [title['name'] for title in titles] == [
+            'Сталкер', 'Без категории'
+        ]
+        assert titles[0]['rating'] == 7 and titles[1]['category'] is None
+        with open(tmp_path / 'genre_title.ndjson', encoding='utf-8') as file:
+            assert len(file.readlines()) == 2
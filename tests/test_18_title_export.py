@@ -0,0 +1,55 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.views import TitleViewSet
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleExport:
+
+    EXPORT_URL = '/api/v1/titles/export/'
+
+    def create_titles(self, count):
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        for idx in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000 + idx, category=movie
+            )
+            title.genre.set([drama] if idx % 2 else [drama, comedy])
+
+    def test_01_streams_all_matching_titles(self, client, monkeypatch):
+        self.create_titles(7)
+        monkeypatch.setattr(TitleViewSet, 'export_chunk_size', 3)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(self.EXPORT_URL, {'genre': 'comedy'})
+            assert response.status_code == HTTPStatus.OK
+            assert response.streaming, (
+                'Проверьте, что выгрузка произведений отдаётся потоково.'
+            )
+            assert response['Content-Type'] == 'application/x-ndjson'
+            lines = b''.join(response.streaming_content).decode().splitlines()
+
+        titles = [json.loads(line) for line in lines]
+        assert [title['name'] for title in titles] == [
+            f'Произведение {idx}' for idx in (0, 2, 4, 6)
+        ], (
+            'Проверьте, что выгрузка учитывает фильтры произведений и '
+            'отдаёт все подходящие записи.'
+        )
+        assert titles[0]['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert {genre['slug'] for genre in titles[0]['genre']} == {
+            'drama', 'comedy'
+        }
+        assert 'rating' in titles[0]
+        assert len(captured.captured_queries) == 5, (
+            'Проверьте, что выгрузка читает произведения пачками с '
+            'предзагрузкой жанров: по два запроса на пачку.'
+        )
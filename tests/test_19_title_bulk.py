@@ -0,0 +1,139 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+from reviews.search import search_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleBulk:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    @pytest.fixture
+    def references(self):
+        Category.objects.create(name='Фильм', slug='movie')
+        Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Комедия', slug='comedy')
+
+    def payload(self, count):
+        return [
+            {
+                'name': f'Новинка {idx}', 'year': 1900 + idx,
+                'category': 'movie', 'genre': ['drama', 'comedy'],
+            }
+            for idx in range(count)
+        ]
+
+    def test_01_bulk_create(self, admin_client, references):
+        items = self.payload(3)
+        items.insert(1, {'name': 'Из будущего', 'year': 3000,
+                         'category': 'movie', 'genre': ['drama']})
+        items.append({'name': 'Без жанра', 'year': 2000,
+                      'category': 'movie', 'genre': ['horror']})
+
+        response = admin_client.post(
+            self.BULK_URL, data=json.dumps(items), content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        data = response.json()
+        assert [title['name'] for title in data['results']] == [
+            'Новинка 0', 'Новинка 1', 'Новинка 2'
+        ], (
+            'Проверьте, что массовое создание сохраняет корректные '
+            'произведения и возвращает их в порядке запроса.'
+        )
+        assert {
+            genre['slug'] for genre in data['results'][0]['genre']
+        } == {'drama', 'comedy'}
+        assert [error['index'] for error in data['errors']] == [1, 4], (
+            'Проверьте, что массовое создание возвращает ошибки '
+            'по индексам элементов.'
+        )
+        assert 'year' in data['errors'][0]['errors']
+        assert Title.objects.count() == 3
+        title = Title.objects.get(pk=data['results'][2]['id'])
+        assert title.name == 'Новинка 2'
+        assert title.name_folded == 'новинка 2'
+        assert list(search_titles(Title.objects.all(), 'новинка 2')) == [
+            title
+        ]
+
+    def test_02_query_count_does_not_depend_on_size(self, admin_client,
+                                                   references):
+        query_counts = []
+        for count in (1, 5, 50):
+            with CaptureQueriesContext(connection) as captured:
+                response = admin_client.post(
+                    self.BULK_URL, data=json.dumps(self.payload(count)),
+                    content_type='application/json'
+                )
+            assert response.status_code == HTTPStatus.CREATED
+            assert len(response.json()['results']) == count
+            query_counts.append(len(captured.captured_queries))
+        assert query_counts[1] == query_counts[2], (
+            'Проверьте, что массовое создание выполняет одинаковое '
+            'количество запросов независимо от числа произведений.'
+        )
+
+    def test_03_bulk_update(self, admin_client, references):
+        first, second = (
+            Title.objects.create(name=f'Старое {idx}', year=1990)
+            for idx in range(2)
+        )
+        response = admin_client.patch(
+            self.BULK_URL,
+            data=json.dumps([
+                {'id': first.id, 'name': 'Обновлённое', 'genre': ['drama']},
+                {'id': 999999, 'name': 'Нет такого'},
+                {'id': second.id, 'year': 3000},
+            ]),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [error['index'] for error in data['errors']] == [1, 2]
+        first.refresh_from_db()
+        assert (first.name, first.name_folded) == (
+            'Обновлённое', 'обновленное'
+        )
+        assert list(first.genre.values_list('slug', flat=True)) == ['drama']
+        assert Title.objects.get(pk=second.id).year == 1990
+
+        response = admin_client.patch(
+            self.BULK_URL,
+            data=json.dumps([
+                {'id': [first.id], 'name': 'Список'},
+                {'id': True, 'name': 'Логическое'},
+                {'id': 2 ** 64, 'name': 'Большое'},
+                {'id': str(first.id), 'name': 'Строка'},
+                'не объект',
+                {'id': first.id, 'year': 1991},
+            ]),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что некорректный id элемента не приводит к ошибке '
+            'сервера.'
+        )
+        data = response.json()
+        assert [error['index'] for error in data['errors']] == [
+            0, 1, 2, 3, 4
+        ], 'Проверьте, что id принимается только как целое число.'
+        first.refresh_from_db()
+        assert (first.name, first.year) == ('Обновлённое', 1991)
+
+    def test_04_bulk_requires_admin_and_list(self, user_client, admin_client):
+        response = user_client.post(
+            self.BULK_URL, data='[]', content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.post(
+            self.BULK_URL, data={'name': 'Одно'},
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,66 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleBatch:
+
+    BATCH_URL = '/api/v1/titles/batch/'
+
+    def create_titles(self, count):
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        titles = []
+        for idx in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=1990, category=movie
+            )
+            title.genre.set([drama])
+            titles.append(title)
+        return titles
+
+    def test_01_batch_in_request_order(self, client):
+        titles = self.create_titles(30)
+        ids = [title.id for title in reversed(titles)] + [999999]
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(
+                self.BATCH_URL, {'ids': ','.join(map(str, ids))}
+            )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data['results']] == ids[:-1], (
+            'Проверьте, что пакетный запрос возвращает произведения '
+            'в порядке списка ids.'
+        )
+        assert data['results'][0]['category']['slug'] == 'movie'
+        assert data['results'][0]['genre'][0]['slug'] == 'drama'
+        assert 'rating' in data['results'][0]
+        assert data['missing'] == [999999], (
+            'Проверьте, что пакетный запрос сообщает об отсутствующих id, '
+            'не прерывая весь ответ.'
+        )
+        assert len(captured.captured_queries) == 2, (
+            'Проверьте, что пакетный запрос загружает произведения '
+            'с категориями и жанрами фиксированным числом запросов.'
+        )
+
+    def test_02_invalid_ids(self, client):
+        response = client.get(self.BATCH_URL, {'ids': '1,abc'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        for ids in ('1,99999999999999999999999', '0', '-5'):
+            response = client.get(self.BATCH_URL, {'ids': ids})
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что id вне диапазона столбца возвращают '
+                'ошибку 400, а не ошибку сервера.'
+            )
+            assert 'ids' in response.json()
+        response = client.get(
+            self.BATCH_URL, {'ids': ','.join(map(str, range(1, 502)))}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
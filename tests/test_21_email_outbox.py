@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.management.commands import send_outbox_emails
+from reviews.models import OutboxEmail
+from reviews.outbox import send_pending_emails
+
+
+class FailingEmailBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('Сервер недоступен.')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, idx):
+        response = client.post(self.URL_SIGNUP, data={
+            'email': f'reader{idx}@yamdb.fake', 'username': f'reader{idx}'
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_01_signup_enqueues_email(self, client, monkeypatch):
+        opened = []
+        monkeypatch.setattr(
+            EmailBackend, 'open', lambda backend: opened.append(backend)
+        )
+        for idx in range(3):
+            self.signup(client, idx)
+        assert not mail.outbox, (
+            'Проверьте, что регистрация не отправляет письмо сама, '
+            'а ставит его в очередь.'
+        )
+        assert OutboxEmail.objects.filter(
+            status=OutboxEmail.PENDING
+        ).count() == 3
+
+        counts = send_pending_emails(batch_size=2)
+        assert counts['sent'] == 3
+        assert [message.to for message in mail.outbox] == [
+            [f'reader{idx}@yamdb.fake'] for idx in range(3)
+        ]
+        assert len(opened) == 1, (
+            'Проверьте, что очередь отправляется пачками через одно '
+            'соединение с почтовым сервером.'
+        )
+        assert not OutboxEmail.objects.exclude(
+            status=OutboxEmail.SENT
+        ).exists()
+        assert send_pending_emails()['sent'] == 0, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_retries_and_dead_letter(self, client):
+        self.signup(client, 0)
+        counts = send_pending_emails(
+            max_attempts=2, connection=FailingEmailBackend()
+        )
+        email = OutboxEmail.objects.get()
+        assert counts['retried'] == 1
+        assert (email.status, email.attempts) == (OutboxEmail.PENDING, 1)
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что после ошибки отправка откладывается.'
+        )
+        assert 'Сервер недоступен' in email.last_error
+
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        send_pending_emails(max_attempts=2, connection=FailingEmailBackend())
+        email.refresh_from_db()
+        assert (email.status, email.attempts) == (OutboxEmail.FAILED, 2), (
+            'Проверьте, что после исчерпания попыток письмо помечается '
+            'как не отправленное и больше не отправляется.'
+        )
+        assert send_pending_emails() == {}
+        assert not mail.outbox
+
+    def test_03_loop_survives_connection_errors(self, client, monkeypatch):
+        self.signup(client, 0)
+        failures = [OSError('Сервер недоступен.')] * 3
+
+        def open_connection(backend):
+            if failures:
+                raise failures.pop()
+
+        class StopLoop(Exception):
+            pass
+
+        delays = []
+
+        def sleep(seconds):
+            delays.append(seconds)
+            if len(delays) > 3:
+                raise StopLoop
+
+        monkeypatch.setattr(EmailBackend, 'open', open_connection)
+        monkeypatch.setattr(send_outbox_emails.time, 'sleep', sleep)
+        with pytest.raises(StopLoop):
+            call_command('send_outbox_emails', loop=True, interval=2)
+        assert delays == [2, 4, 8, 2], (
+            'Проверьте, что ошибка соединения с почтовым сервером '
+            'не останавливает обработчик очереди, а повторяется '
+            'с растущей задержкой.'
+        )
+        assert [message.to for message in mail.outbox] == [
+            ['reader0@yamdb.fake']
+        ]
+
+        failures.append(OSError('Сервер недоступен.'))
+        with pytest.raises(OSError):
+            call_command('send_outbox_emails')
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Title
+
+
+def user_queries(captured, table):
+    return [
+        query['sql'] for query in captured.captured_queries
+        if f'FROM "{table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22JwtClaims:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_TITLES = '/api/v1/titles/'
+    URL_ME = '/api/v1/users/me/'
+
+    def get_client(self, user):
+        response = APIClient().post(self.URL_TOKEN, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert 'token' in response.json(), (
+            f'Проверьте, что эндпоинт `{self.URL_TOKEN}` возвращает токен '
+            'в поле `token`.'
+        )
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        return client
+
+    def test_01_requests_do_not_read_user(self, admin, django_user_model):
+        client = self.get_client(admin)
+        category = Category.objects.create(name='Фильм', slug='films')
+        data = {'name': 'Поворот', 'year': 2000, 'category': category.slug}
+        client.post(self.URL_TITLES, data=data)
+
+        table = django_user_model._meta.db_table
+        with CaptureQueriesContext(connection) as captured:
+            response = client.post(self.URL_TITLES, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert not user_queries(captured, table), (
+            'Проверьте, что пользователь собирается из полей токена '
+            'без запроса к базе.'
+        )
+
+    def test_02_claims_user_as_author(self, user):
+        client = self.get_client(user)
+        category = Category.objects.create(name='Фильм', slug='films')
+        title = Title.objects.create(
+            name='Поворот', year=2000, category=category
+        )
+        response = client.post(
+            f'{self.URL_TITLES}{title.pk}/reviews/',
+            data={'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        assert title.reviews.get().author_id == user.pk
+
+        response = client.patch(self.URL_ME, data={'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+        user.refresh_from_db()
+        assert (user.bio, user.email) == ('Новое', 'testuser@yamdb.fake'), (
+            f'Проверьте, что `{self.URL_ME}` обновляет пользователя, '
+            'не затирая поля, которых нет в токене.'
+        )
+
+    def test_03_role_change_and_deletion_revoke_token(self, admin):
+        client = self.get_client(admin)
+        response = client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.OK
+
+        admin.role = 'user'
+        admin.save()
+        response = client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены роли токен со старой ролью '
+            'перестаёт действовать.'
+        )
+
+        client = self.get_client(admin)
+        assert client.get(self.URL_ME).status_code == HTTPStatus.OK
+        admin.delete()
+        assert client.get(self.URL_ME).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
@@ -0,0 +1,100 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api import viewsets
+from api_yamdb.settings import SQLITE_PRAGMAS
+from api_yamdb.sqlite import writes
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23SqliteProfile:
+
+    def test_01_pragmas_and_immediate_transactions(self):
+        with connection.cursor() as cursor:
+            for name in ('cache_size', 'busy_timeout'):
+                cursor.execute(f'PRAGMA {name}')
+                assert cursor.fetchone()[0] == SQLITE_PRAGMAS[name], (
+                    f'Проверьте, что PRAGMA {name} выставляется при '
+                    'открытии соединения.'
+                )
+
+        with CaptureQueriesContext(connection) as captured:
+            with transaction.atomic():
+                pass
+        assert captured.captured_queries[0]['sql'] == 'BEGIN IMMEDIATE', (
+            'Проверьте, что транзакции сразу берут блокировку записи.'
+        )
+
+    def test_02_locked_writes_are_retried(self, monkeypatch):
+        monkeypatch.setattr(writes.time, 'sleep', lambda seconds: None)
+        calls = []
+
+        def write():
+            calls.append(connection.in_atomic_block)
+            if len(calls) < 3:
+                raise OperationalError('database is locked')
+            return 'ok'
+
+        assert writes.run_serialized(write) == 'ok'
+        assert calls == [True] * 3, (
+            'Проверьте, что запись при блокировке базы повторяется '
+            'в новой транзакции.'
+        )
+
+        calls.clear()
+        with pytest.raises(OperationalError):
+            writes.run_serialized(write, attempts=2)
+        assert len(calls) == 2
+
+        def broken():
+            calls.append(True)
+            raise OperationalError('no such table: missing')
+
+        calls.clear()
+        with pytest.raises(OperationalError):
+            writes.run_serialized(broken)
+        assert len(calls) == 1, (
+            'Проверьте, что ошибки, не связанные с блокировкой, '
+            'не повторяются.'
+        )
+
+    def test_03_benchmark(self):
+        out = StringIO()
+        call_command(
+            'sqlite_benchmark', readers=1, writers=2, seconds=0.3, stdout=out
+        )
+        lines = out.getvalue().splitlines()
+        assert [line.split(':')[0] for line in lines] == [
+            'default', 'production'
+        ]
+        assert lines[1].endswith('ошибок записи 0.')
+
+    def test_04_custom_write_actions_are_serialized(self, monkeypatch,
+                                                    admin_client,
+                                                    user_client):
+        calls = []
+
+        def run_serialized(func, *args, **kwargs):
+            calls.append(func.func.__name__)
+            return writes.run_serialized(func, *args, **kwargs)
+
+        monkeypatch.setattr(viewsets, 'run_serialized', run_serialized)
+        for method in ('post', 'patch'):
+            getattr(admin_client, method)(
+                '/api/v1/titles/bulk/', data='[]',
+                content_type='application/json'
+            )
+        user_client.patch(
+            '/api/v1/users/me/', data={'bio': 'Читатель'},
+            content_type='application/json'
+        )
+        assert calls == [
+            'bulk_create', 'bulk_update', 'update_current_user_info'
+        ], (
+            'Проверьте, что массовые операции с произведениями и изменение '
+            'своего профиля выполняются через run_serialized.'
+        )
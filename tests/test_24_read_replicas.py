@@ -0,0 +1,139 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections, transaction
+from rest_framework.test import APIClient
+
+from api_yamdb import replicas, settings
+from reviews.management.commands import sync_replicas
+from reviews.models import Category, Title, YamdbUser
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    connections.databases[REPLICA] = dict(
+        connections.databases['default'],
+        NAME=str(tmp_path / 'replica.sqlite3'),
+    )
+    monkeypatch.setattr(replicas, 'DATABASE_REPLICAS', (REPLICA,))
+    call_command('sync_replicas')
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections.databases[REPLICA]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ReadReplicas:
+
+    URL_TITLES = '/api/v1/titles/'
+
+    def test_01_router_without_replicas(self):
+        router = replicas.PrimaryReplicaRouter()
+        token = replicas.replica_reads.set(True)
+        try:
+            assert router.db_for_read(Title) == 'default'
+        finally:
+            replicas.replica_reads.reset(token)
+
+    def test_02_reads_go_to_replica(self, replica, client, admin_client):
+        Category.objects.create(name='Фильм', slug='films')
+        response = admin_client.post(self.URL_TITLES, data={
+            'name': 'Сталкер', 'year': 1979, 'category': 'films'
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        url = f'{self.URL_TITLES}{response.json()["id"]}/'
+
+        assert admin_client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что клиент сразу после записи читает из основной '
+            'базы и видит свои изменения.'
+        )
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что безопасные запросы других клиентов читают '
+            'с реплики.'
+        )
+
+        call_command('sync_replicas')
+        assert client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что после синхронизации реплика видит новые '
+            'записи.'
+        )
+
+        Title.objects.filter(name='Сталкер').update(name='Солярис')
+        cache.clear()
+        response = admin_client.get(url)
+        assert response.json()['name'] == 'Сталкер', (
+            'Проверьте, что по окончании окна чтения своих записей '
+            'клиент снова читает с реплики.'
+        )
+
+    def test_03_writes_and_transactions_use_primary(self, replica):
+        router = replicas.PrimaryReplicaRouter()
+        token = replicas.replica_reads.set(True)
+        try:
+            assert router.db_for_read(Title) == REPLICA
+            assert router.db_for_write(Title) == 'default'
+            with transaction.atomic():
+                assert router.db_for_read(Title) == 'default'
+        finally:
+            replicas.replica_reads.reset(token)
+        assert router.db_for_read(Title) == 'default', (
+            'Проверьте, что вне HTTP-запросов чтение идёт из основной базы.'
+        )
+
+    def test_04_new_user_reads_own_profile(self, replica, client):
+        response = client.post('/api/v1/auth/signup/', data={
+            'email': 'reader@yamdb.fake', 'username': 'reader'
+        })
+        assert response.status_code == HTTPStatus.OK
+        user = YamdbUser.objects.get(username='reader')
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+
+        user_client = APIClient()
+        user_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        assert user_client.get(self.URL_TITLES).status_code == HTTPStatus.OK
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый пользователь видит свой профиль до '
+            'синхронизации реплик.'
+        )
+        assert response.json()['username'] == 'reader'
+
+    def test_05_window_covers_replica_lag(self, replica, monkeypatch):
+        assert settings.REPLICA_READ_YOUR_WRITES_WINDOW >= (
+            settings.REPLICA_SYNC_INTERVAL
+            + settings.REPLICA_SYNC_MAX_DURATION
+        ), (
+            'Проверьте, что окно чтения своих записей не короче '
+            'возможного отставания реплики.'
+        )
+
+        class StopLoop(Exception):
+            pass
+
+        def sleep(seconds):
+            raise StopLoop
+
+        monkeypatch.setattr(sync_replicas.time, 'sleep', sleep)
+        err = StringIO()
+        with pytest.raises(StopLoop):
+            call_command(
+                'sync_replicas', loop=True,
+                interval=settings.REPLICA_SYNC_INTERVAL + 1,
+                stdout=StringIO(), stderr=err
+            )
+        assert 'REPLICA_SYNC_INTERVAL' in err.getvalue(), (
+            'Проверьте, что sync_replicas предупреждает об интервале '
+            'больше, чем рассчитано окно чтения своих записей.'
+        )
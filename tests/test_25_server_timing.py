@@ -0,0 +1,74 @@
+import json
+import logging
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import timing
+from reviews.models import Category, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25ServerTiming:
+
+    URL_TITLES = '/api/v1/titles/'
+
+    def test_01_server_timing_header_and_log(self, client, caplog,
+                                             monkeypatch):
+        monkeypatch.setattr(timing, 'SERVER_TIMING_SAMPLE_RATE', 1)
+        category = Category.objects.create(name='Фильм', slug='films')
+        for idx in range(3):
+            Title.objects.create(
+                name=f'Фильм {idx}', year=1990, category=category
+            )
+
+        with caplog.at_level(logging.INFO, logger='api.timing'):
+            with CaptureQueriesContext(connection) as captured:
+                response = client.get(self.URL_TITLES)
+        header = response['Server-Timing']
+        metrics = dict(
+            re.match(r'([\w-]+);dur=([\d.]+)', metric).groups()
+            for metric in header.split(', ')
+        )
+        assert set(metrics) == {
+            'total', 'db', 'db-slowest', 'serializer'
+        }, (
+            'Проверьте, что заголовок Server-Timing содержит общее время, '
+            'время SQL-запросов, самый медленный запрос и сериализацию.'
+        )
+        assert float(metrics['serializer']) > 0
+        assert float(metrics['total']) >= float(metrics['db'])
+        queries = len(captured.captured_queries)
+        assert f'desc="{queries} queries"' in header
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['path'] == self.URL_TITLES
+        assert record['status'] == 200
+        assert record['db_queries'] == queries
+        assert record['db_slowest_sql'].startswith('SELECT'), (
+            'Проверьте, что в лог пишется текст самого медленного запроса.'
+        )
+
+    def test_02_sampling(self, client, caplog, monkeypatch):
+        monkeypatch.setattr(timing, 'SERVER_TIMING_SAMPLE_RATE', 0)
+        with caplog.at_level(logging.INFO, logger='api.timing'):
+            response = client.get(self.URL_TITLES)
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что запросы вне выборки не измеряются.'
+        )
+        assert not caplog.records
+
+    def test_03_streaming_responses_are_skipped(self, client, caplog,
+                                                monkeypatch):
+        monkeypatch.setattr(timing, 'SERVER_TIMING_SAMPLE_RATE', 1)
+        with caplog.at_level(logging.INFO, logger='api.timing'):
+            response = client.get(f'{self.URL_TITLES}export/')
+            b''.join(response.streaming_content)
+        assert response.streaming
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что потоковые ответы не получают заголовок '
+            'Server-Timing с неполными цифрами.'
+        )
+        assert not caplog.records
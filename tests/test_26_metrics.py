@@ -0,0 +1,158 @@
+import os
+import re
+import threading
+from http import HTTPStatus
+
+import pytest
+
+from api import metrics
+from api.metrics import MetricsRegistry
+
+
+def parse(text):
+    return {
+        name: float(value)
+        for name, value in re.findall(r'^(\S+) (\S+)$', text, re.M)
+        if not name.startswith('#')
+    }
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    registry = MetricsRegistry(tmp_path, buckets=(0.1, 1), flush_interval=60)
+    monkeypatch.setattr(metrics, 'registry', registry)
+    return registry
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Metrics:
+
+    URL_METRICS = '/api/v1/metrics/'
+
+    def test_01_metrics_endpoint(self, registry, client, admin_client,
+                                 user_client):
+        assert client.get(self.URL_METRICS).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.URL_METRICS).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), 'Проверьте, что метрики доступны только администратору.'
+
+        for _ in range(2):
+            client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/999/')
+        client.post('/api/v1/auth/token/', data={})
+
+        response = admin_client.get(self.URL_METRICS)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith(
+            'text/plain; version=0.0.4'
+        )
+        values = parse(response.content.decode())
+        labels = 'view="TitleViewSet.list",method="GET"'
+        assert values[f'yamdb_requests_total{{{labels},status="200"}}'] == 2
+        assert values[
+            'yamdb_requests_total{view="TitleViewSet.retrieve",'
+            'method="GET",status="404"}'
+        ] == 1
+        assert values[
+            'yamdb_requests_total{view="TokenView",method="POST",'
+            'status="400"}'
+        ] == 1, (
+            'Проверьте, что запросы считаются по представлению, действию '
+            'и статусу ответа.'
+        )
+        assert values[
+            f'yamdb_request_duration_seconds_bucket{{{labels},le="+Inf"}}'
+        ] == 2
+        assert values[
+            f'yamdb_request_duration_seconds_count{{{labels}}}'
+        ] == 2
+        assert values[f'yamdb_db_queries_total{{{labels}}}'] > 0
+        assert values[f'yamdb_response_bytes_total{{{labels}}}'] > 0
+
+    def test_02_merge_processes_and_threads(self, registry, tmp_path):
+        other = MetricsRegistry(tmp_path, buckets=(0.1, 1), pid=999999)
+        other.observe('TokenView', 'POST', 200, 0.5, 2, 10)
+        other.flush()
+
+        def observe():
+            for _ in range(1000):
+                registry.observe('TokenView', 'POST', 200, 0.05, 1, 1)
+
+        threads = [threading.Thread(target=observe) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        values = parse(registry.render())
+        labels = 'view="TokenView",method="POST"'
+        assert values[
+            f'yamdb_requests_total{{{labels},status="200"}}'
+        ] == 4001, (
+            'Проверьте, что счётчики потоков не теряются, а счётчики '
+            'процессов суммируются.'
+        )
+        assert values[
+            f'yamdb_request_duration_seconds_bucket{{{labels},le="0.1"}}'
+        ] == 4000
+        assert values[
+            f'yamdb_request_duration_seconds_bucket{{{labels},le="1"}}'
+        ] == 4001
+        assert values[f'yamdb_db_queries_total{{{labels}}}'] == 4002
+
+    def test_03_flush_errors_do_not_break_requests(self, registry, tmp_path,
+                                                  client):
+        errors = []
+
+        def flush():
+            for _ in range(50):
+                try:
+                    registry.flush()
+                except OSError as error:
+                    errors.append(error)
+
+        threads = [threading.Thread(target=flush) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, (
+            'Проверьте, что одновременная запись метрик из нескольких '
+            'потоков не приводит к ошибкам.'
+        )
+
+        registry.directory = tmp_path / 'metrics.json'
+        registry.directory.write_text('')
+        registry.flush_interval = 0
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ошибка записи метрик не приводит к ошибке '
+            'запроса.'
+        )
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='Нужен os.fork.')
+    def test_04_forked_workers_are_summed(self, registry):
+        registry.observe('TokenView', 'POST', 200, 0.05, 1, 1)
+        children = []
+        for _ in range(3):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    registry.observe('TokenView', 'POST', 200, 0.05, 1, 1)
+                    registry.flush()
+                finally:
+                    os._exit(0)
+            children.append(pid)
+        for pid in children:
+            os.waitpid(pid, 0)
+
+        values = parse(registry.render())
+        assert values[
+            'yamdb_requests_total{view="TokenView",method="POST",'
+            'status="200"}'
+        ] == 4, (
+            'Проверьте, что рабочие процессы после fork пишут метрики '
+            'в свои файлы и не переносят счётчики главного процесса.'
+        )